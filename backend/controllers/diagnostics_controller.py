@@ -0,0 +1,29 @@
+# controllers/diagnostics_controller.py
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+from services.index_service import explain_query_shapes
+from utils.profiling import PROFILING_ENABLED, profile_store
+
+router = APIRouter()
+
+@router.get("/diagnostics/query-plans")
+async def get_query_plans():
+    """Explain the hot query shapes and list those that still fall back to a COLLSCAN."""
+    return await explain_query_shapes()
+
+@router.get("/diagnostics/profiles")
+async def list_profiles():
+    """Recent request profiles, newest first (requests sent with X-Profile: 1 or ?profile=1)."""
+    return {"enabled": PROFILING_ENABLED, "profiles": profile_store.list()}
+
+@router.get("/diagnostics/profiles/{profile_id}")
+async def get_profile(profile_id: str, format: str = "speedscope"):
+    """One request profile as speedscope JSON or as collapsed stacks (format=collapsed) for flamegraph.pl."""
+    profile = profile_store.get(profile_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    if format == "collapsed":
+        return PlainTextResponse(profile.collapsed())
+    if format != "speedscope":
+        raise HTTPException(status_code=400, detail="format must be speedscope or collapsed")
+    return profile.speedscope()
@@ -1,13 +1,16 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
-from models.map_model import MapRequest, UpdateMapRequest
+from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query, Request
+from models.map_model import MapRequest, UpdateMapRequest, PathBatchRequest
 from services.map_service import (
     get_maps_service, 
-    get_map_by_id_service, 
+    get_map_response_service,
     save_map_service, 
     update_map_service, 
     upload_map_service,
     get_latest_map_id
 )
+from services.pathfinding_service import plan_paths_service
+from utils.pagination import page_body
 
 router = APIRouter()
 
@@ -16,12 +19,16 @@ async def root():
     return {"message": "API is working!"}
 
 @router.get("/api/maps")
-async def get_maps():
-    return await get_maps_service()
+async def get_maps(cursor: Optional[str] = None, limit: int = Query(100, gt=0)):
+    maps, next_cursor = await get_maps_service(cursor, limit)
+    return page_body(maps, next_cursor)
 
 @router.get("/api/maps/id/{map_id}")
-async def get_map_by_id(map_id: str):
-    return await get_map_by_id_service(map_id)
+async def get_map_by_id(map_id: str, request: Request):
+    # JSON by default; Accept: application/vnd.amr-map returns the compact encoding
+    return await get_map_response_service(
+        map_id, request.headers.get("accept"), request.headers.get("if-none-match")
+    )
 
 @router.post("/api/maps")
 async def save_map(map_data: MapRequest):
@@ -37,4 +44,8 @@ async def upload_map(file: UploadFile = File(...)):
 
 @router.get("/api/maps/latest-id")
 async def latest_id():
-    return await get_latest_map_id()
\ No newline at end of file
+    return await get_latest_map_id()
+
+@router.post("/api/maps/{map_id}/paths")
+async def plan_paths(map_id: str, request: PathBatchRequest):
+    return await plan_paths_service(map_id, request.queries)
\ No newline at end of file
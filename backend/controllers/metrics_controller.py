@@ -0,0 +1,15 @@
+# controllers/metrics_controller.py
+from fastapi import APIRouter, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from services.robot_service import idle_robot_counts
+from utils.metrics import IDLE_ROBOTS
+
+router = APIRouter()
+
+@router.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of the request, MongoDB and putaway metrics."""
+    IDLE_ROBOTS.clear()
+    for map_id, idle in idle_robot_counts().items():
+        IDLE_ROBOTS.labels(map_id).set(idle)
+    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
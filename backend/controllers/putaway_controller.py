@@ -1,7 +1,9 @@
 from fastapi import APIRouter, HTTPException
-from models.putaway_models import PickRequest, PutawayOrderRequest
+from models.putaway_models import PickRequest, PutawayLoadRequest, PutawayOrderRequest
+from services.load_generator_service import generate_putaway_load
 from services.putaway_service import generate_putaway_order
 from utils.mongo_utils import putaway_orders, customer_orders
+from utils.responses import MongoJSONResponse
 
 router = APIRouter()
 
@@ -15,13 +17,23 @@ async def create_putaway_order(request: PutawayOrderRequest):
         "putaway_order_code": order_dict["body"]["orders"][0]["order_details"]["putaway_order_code"]
     }
 
+@router.post("/orders/putaway/load")
+async def create_putaway_load(request: PutawayLoadRequest):
+    return await generate_putaway_load(
+        request.map_id,
+        count=request.count,
+        orders_per_hour=request.orders_per_hour,
+        hours=request.hours,
+        seed=request.seed,
+        start_time=request.start_time
+    )
+
 @router.get("/orders/putaway/latest")
 async def get_latest_putaway_order():
     order = await putaway_orders.find_one(sort=[("_id", -1)])
     if not order:
         raise HTTPException(status_code=404, detail="No putaway orders found")
-    order["_id"] = str(order["_id"])
-    return order
+    return MongoJSONResponse(order)
 
 @router.get("/orders/putaway/by-code/{putaway_order_code}")
 async def get_putaway_order_by_code(putaway_order_code: str):
@@ -30,8 +42,7 @@ async def get_putaway_order_by_code(putaway_order_code: str):
     })
     if not order:
         raise HTTPException(status_code=404, detail="Putaway order not found")
-    order["_id"] = str(order["_id"])
-    return order
+    return MongoJSONResponse(order)
 
 @router.post("/orders/pick")
 async def create_pick_order(data: PickRequest):
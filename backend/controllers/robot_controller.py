@@ -1,6 +1,6 @@
 from fastapi import APIRouter, HTTPException, Query
-from models.robot_model import RobotHeartbeat, RobotOut
-from services.robot_service import update_robot, get_idle_robots_by_map, add_robot as add_robot_service
+from models.robot_model import RobotHeartbeat, RobotOut, HeartbeatBatch
+from services.robot_service import update_robot, update_robots_batch, get_idle_robots_by_map, add_robot as add_robot_service
 from typing import Dict, List
 
 router = APIRouter()
@@ -9,6 +9,10 @@ router = APIRouter()
 async def update_robot_status(data: RobotHeartbeat):
     return await update_robot(data)
 
+@router.post("/robots/heartbeat/batch")
+async def update_robot_status_batch(data: HeartbeatBatch):
+    return await update_robots_batch(data.heartbeats)
+
 @router.get("/robots/idle", response_model=Dict[str, List[RobotOut]])
 async def get_idle_robots(map_id: str = Query(..., description="Map ID to filter robots")):
     return await get_idle_robots_by_map(map_id)
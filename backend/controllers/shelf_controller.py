@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from models.shelf_model import ShelfStatusUpdate
 from services.shelf_service import update_shelf, add_shelf, get_shelves
+from utils.pagination import page_body
+from utils.responses import MongoJSONResponse
 
 router = APIRouter()
 
@@ -30,12 +33,14 @@ async def add_shelf_route(data: ShelfStatusUpdate):
         raise HTTPException(status_code=500, detail=f"Error adding shelf: {str(e)}")
 
 @router.get("/station/shelves")
-async def get_shelves_route():
-    """Retrieve all shelves from the database."""
+async def get_shelves_route(cursor: Optional[str] = None, limit: int = Query(100, gt=0), fields: Optional[str] = None):
+    """Retrieve a page of shelves."""
     try:
-        shelves = await get_shelves()
-        if not shelves:
+        shelves, next_cursor = await get_shelves(cursor, limit, fields)
+        if not shelves and not cursor:
             raise HTTPException(status_code=404, detail="No shelves available")
-        return shelves
+        return MongoJSONResponse(page_body(shelves, next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching shelves: {str(e)}")
@@ -0,0 +1,16 @@
+# controllers/simulation_controller.py
+from fastapi import APIRouter
+from models.simulation_model import SimulationRequest
+from services.simulation_service import run_simulation_service
+
+router = APIRouter()
+
+@router.post("/simulation/run")
+async def run_simulation(request: SimulationRequest):
+    return await run_simulation_service(
+        request.map_id,
+        hours=request.hours,
+        robot_speed=request.robot_speed,
+        service_time_base=request.service_time_base,
+        service_time_per_unit=request.service_time_per_unit
+    )
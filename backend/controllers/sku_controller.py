@@ -1,6 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 from models.sku_model import SKURequest
 from services.sku_service import save_sku_service, get_sku_service, get_all_skus_service
+from services.sku_import_service import import_skus_stream
+from utils.pagination import page_body
+from utils.responses import BodyStreamingResponse, MongoJSONResponse
 
 router = APIRouter()
 
@@ -21,8 +25,21 @@ async def get_sku(sku_id: str):
 
 
 @router.get("/get-all-skus")
-async def get_all_skus(skip: int = 0, limit: int = 10):
+async def get_all_skus(cursor: Optional[str] = None, limit: int = Query(10, gt=0)):
     try:
-        return await get_all_skus_service(skip, limit)
+        skus, next_cursor = await get_all_skus_service(cursor, limit)
+        return MongoJSONResponse(page_body(skus, next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail="Error fetching SKUs: " + str(e))
+
+
+@router.post("/import-skus")
+async def import_skus(request: Request, format: Optional[str] = Query(None, pattern="^(ndjson|csv)$")):
+    """
+    Stream SKUs (one SKUItem per NDJSON line or CSV row) from the request body.
+    The response is NDJSON: a progress line per written batch, then a summary.
+    """
+    fmt = format or ("csv" if "csv" in request.headers.get("content-type", "") else "ndjson")
+    return BodyStreamingResponse(import_skus_stream(request.stream(), fmt), media_type="application/x-ndjson")
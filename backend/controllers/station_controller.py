@@ -1,6 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
 from models.station_model import StationLoadUpdate
 from services.station_service import update_station, add_station, get_stations
+from utils.pagination import page_body
+from utils.responses import MongoJSONResponse
 
 router = APIRouter()
 
@@ -25,12 +28,14 @@ async def add_putaway_station(data: StationLoadUpdate):
         raise HTTPException(status_code=500, detail=f"Error adding putaway station: {str(e)}")
 
 @router.get("/station/putaway-stations")
-async def get_putaway_stations():
-    """Retrieve all putaway stations from the database."""
+async def get_putaway_stations(cursor: Optional[str] = None, limit: int = Query(100, gt=0), fields: Optional[str] = None):
+    """Retrieve a page of putaway stations."""
     try:
-        stations = await get_stations()
-        if not stations:
+        stations, next_cursor = await get_stations(cursor, limit, fields)
+        if not stations and not cursor:
             raise HTTPException(status_code=404, detail="No putaway stations available")
-        return stations
+        return MongoJSONResponse(page_body(stations, next_cursor))
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching putaway stations: {str(e)}")
@@ -0,0 +1,20 @@
+# controllers/stream_controller.py
+from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
+from services.robot_service import get_fleet_snapshot
+from services.stream_service import map_event_stream
+
+router = APIRouter()
+
+@router.get("/stream/maps/{map_id}")
+async def stream_map(map_id: str):
+    """
+    Server-Sent Events for one map: a robot snapshot first, then "delta" events
+    with the robots, tasks and stations that changed during each tick.
+    """
+    snapshot = await get_fleet_snapshot(map_id)
+    return StreamingResponse(
+        map_event_stream(map_id, snapshot),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,13 +1,19 @@
 # controllers/task_controller.py
+from typing import Optional
 from fastapi import APIRouter, Query
-from services.task_service import fetch_putaway_tasks, generate_putaway_tasks
-from models.task_model import TaskGenerationRequest
+from services.task_service import fetch_putaway_tasks, generate_putaway_tasks, generate_wave_tasks, update_task_status
+from services.route_service import plan_routes_service
+from models.task_model import TaskGenerationRequest, TaskStatusUpdate, WaveGenerationRequest
+from utils.pagination import page_body
+from utils.responses import MongoJSONResponse
 
 router = APIRouter()
 
 @router.get("/task/putaway-tasks")
-async def get_putaway_tasks(map_id: str = Query(...)):
-    return {"tasks": await fetch_putaway_tasks(map_id)}
+async def get_putaway_tasks(map_id: str = Query(...), cursor: Optional[str] = None, limit: int = Query(100, gt=0),
+                            fields: Optional[str] = None):
+    tasks, next_cursor = await fetch_putaway_tasks(map_id, cursor, limit, fields)
+    return MongoJSONResponse(page_body(tasks, next_cursor))
 
 @router.post("/task/generate-putaway")
 async def generate_putaway(request: TaskGenerationRequest):
@@ -15,3 +21,19 @@ async def generate_putaway(request: TaskGenerationRequest):
     if request.mode not in ["proximity", "energy", "load_balanced"]:
         return {"error": "Invalid mode. Choose from 'proximity', 'energy', or 'load_balanced'."}
     return await generate_putaway_tasks(mode=request.mode)
+
+@router.post("/task/generate-wave")
+async def generate_wave(request: WaveGenerationRequest):
+    return await generate_wave_tasks(request.map_id, request.max_orders)
+
+@router.post("/task/status/update")
+async def update_putaway_task_status(data: TaskStatusUpdate):
+    return await update_task_status(data.task_id, data.status)
+
+@router.get("/task/routes")
+async def get_task_routes(map_id: str = Query(...), max_steps: Optional[int] = Query(None, gt=0)):
+    return await plan_routes_service(map_id, max_steps)
+
+@router.post("/task/routes/dispatch")
+async def dispatch_task_routes(map_id: str = Query(...), max_steps: Optional[int] = Query(None, gt=0)):
+    return await plan_routes_service(map_id, max_steps, dispatch=True)
@@ -0,0 +1,52 @@
+# loadgen.py
+# Write a reproducible batch of putaway orders to the configured MongoDB:
+#   python loadgen.py <map_id> --count 100000 [--seed 0]
+#   python loadgen.py <map_id> --orders-per-hour 5000 [--hours 9] [--seed 0]
+import argparse
+import asyncio
+import json
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.load_generator_service import generate_putaway_load  # noqa: E402  (needs MONGO_URI loaded)
+
+
+def positive(kind):
+    def parse(text):
+        value = kind(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+        return value
+    parse.__name__ = kind.__name__  # argparse names the type in "invalid int value" errors
+    return parse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate seeded putaway orders for one map.")
+    parser.add_argument("map_id")
+    parser.add_argument("--count", type=positive(int), default=None, help="number of orders (upper bound with --orders-per-hour)")
+    parser.add_argument("--orders-per-hour", type=positive(float), default=None, help="Poisson arrival rate")
+    parser.add_argument("--hours", type=positive(float), default=None, help="arrival window, defaults to working_hours")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-time", type=int, default=None, help="ms timestamp of the first window, defaults to now")
+    parser.add_argument("--batch-size", type=int, default=None, help="orders per insert_many")
+    args = parser.parse_args()
+    if not args.count and not args.orders_per_hour:
+        parser.error("give --count or --orders-per-hour")
+
+    options = {"batch_size": args.batch_size} if args.batch_size else {}
+    summary = asyncio.run(generate_putaway_load(
+        args.map_id,
+        count=args.count,
+        orders_per_hour=args.orders_per_hour,
+        hours=args.hours,
+        seed=args.seed,
+        start_time=args.start_time,
+        **options
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
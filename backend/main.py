@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv  # Import the dotenv module
@@ -11,11 +12,32 @@ from controllers.inventory_controller import router as inventory_router
 from controllers.google_sheets_controller import router as google_sheets_router
 from controllers.sku_controller import router as sku_router
 from controllers.map_controller import router as map_router
+from controllers.simulation_controller import router as simulation_router
+from controllers.stream_controller import router as stream_router
+from controllers.diagnostics_controller import router as diagnostics_router
+from controllers.metrics_controller import router as metrics_router
+from services.index_service import ensure_indexes
+from services.robot_service import fleet_store
+from services.stream_service import stream_hub
+from utils.metrics import MetricsMiddleware
+from utils.profiling import PROFILE_HEADER, PROFILING_ENABLED, ProfilingMiddleware
 
 # Load environment variables from the .env file
 load_dotenv()
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await ensure_indexes()
+    # Robot heartbeats are buffered in memory and written to robot_status in the background
+    fleet_store.start()
+    stream_hub.start()
+    yield
+    await stream_hub.stop()
+    await fleet_store.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Allow origins for CORS
 app.add_middleware(
@@ -24,7 +46,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", PROFILE_HEADER],
 )
+# Latency / in-flight requests per router, scraped from /metrics
+app.add_middleware(MetricsMiddleware)
+# Opt-in per-request profiles (X-Profile: 1 or ?profile=1), listed under /diagnostics/profiles.
+# Not installed at all unless PROFILING_ENABLED is set.
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
 
 # Include the routers
 app.include_router(inventory_router)
@@ -36,6 +65,10 @@ app.include_router(station_router)
 app.include_router(google_sheets_router)
 app.include_router(sku_router)
 app.include_router(map_router)
+app.include_router(simulation_router)
+app.include_router(stream_router)
+app.include_router(diagnostics_router)
+app.include_router(metrics_router)
 
 
 
@@ -1,6 +1,9 @@
-from pydantic import BaseModel
+import os
+from pydantic import BaseModel, conlist
 from typing import List, Optional
 
+MAX_PATH_QUERIES = int(os.getenv("MAX_PATH_QUERIES", 1000))
+
 class Component(BaseModel):
     id: str
     type: str
@@ -18,3 +21,14 @@ class UpdateMapRequest(BaseModel):
     rows: Optional[int]
     cols: Optional[int]
     components: Optional[List[Component]]
+
+class Cell(BaseModel):
+    row: int
+    col: int
+
+class PathQuery(BaseModel):
+    start: Cell
+    goal: Cell
+
+class PathBatchRequest(BaseModel):
+    queries: conlist(PathQuery, max_items=MAX_PATH_QUERIES)
@@ -1,6 +1,6 @@
 
 # models/putaway_models.py
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 class PrintInfo(BaseModel):
@@ -60,3 +60,11 @@ class PickRequest(BaseModel):
 
 class PutawayOrderRequest(BaseModel):
     currentMapId: str
+
+class PutawayLoadRequest(BaseModel):
+    map_id: str
+    count: Optional[int] = Field(None, gt=0)  # number of orders; with orders_per_hour, an upper bound
+    orders_per_hour: Optional[float] = Field(None, gt=0)  # Poisson arrival rate for creation_date
+    hours: Optional[float] = Field(None, gt=0)  # arrival window, defaults to the putaway working_hours shift
+    seed: int = 0
+    start_time: Optional[int] = None  # ms timestamp of the first arrival window, defaults to now
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, List
 
 class Location(BaseModel):
     x: int
@@ -26,3 +26,6 @@ class RobotOut(BaseModel):
     status: str
     location: Dict[str, int]
     map_id: str
+
+class HeartbeatBatch(BaseModel):
+    heartbeats: List[RobotHeartbeat]
@@ -1,9 +1,11 @@
 from pydantic import BaseModel
-from typing import Dict, List
+from typing import Dict, List, Union
 
 class ShelfLevelDetails(BaseModel):
     available_space: float
     sku_details: List[Dict[str, int]]
+    # Space held by putaway tasks not completed yet: {task_id, sku_id, amount}
+    reservations: List[Dict[str, Union[int, str]]] = []
 
 class ShelfStatusUpdate(BaseModel):
     shelf_id: str
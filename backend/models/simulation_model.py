@@ -0,0 +1,9 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class SimulationRequest(BaseModel):
+    map_id: str
+    hours: Optional[float] = None  # defaults to the putaway working_hours shift
+    robot_speed: float = Field(1.0, gt=0)  # cells per second
+    service_time_base: float = 10.0  # seconds per station visit
+    service_time_per_unit: float = 2.0  # extra seconds per unit put away
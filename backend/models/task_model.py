@@ -1,4 +1,13 @@
 from pydantic import BaseModel
+from typing import Optional
 
 class TaskGenerationRequest(BaseModel):
     mode: str  # expected: 'proximity', 'energy', or 'load_balanced'
+
+class WaveGenerationRequest(BaseModel):
+    map_id: str
+    max_orders: Optional[int] = None  # oldest pending orders first; all of them when unset
+
+class TaskStatusUpdate(BaseModel):
+    task_id: str
+    status: str  # e.g. 'pending', 'in_progress', 'completed'
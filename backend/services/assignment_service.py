@@ -0,0 +1,103 @@
+# services/assignment_service.py
+
+import os
+import numpy as np
+from utils.assignment import greedy_assignment, optimal_assignment
+from utils.pathfinding import distance_matrix
+
+
+def robot_cell(robot):
+    # Robot locations are stored as {"x": row, "y": col}
+    return robot["location"]["x"], robot["location"]["y"]
+
+
+class ProximityAssigner:
+    """
+    Assigns each task to the robot under the task cap with the shortest travel
+    distance to the task's shelf on the map grid. Distances come from one
+    breadth-first search per distinct shelf, run up front by prepare() so the
+    work can happen off the event loop.
+    """
+
+    def __init__(self, robots, map_grid, max_tasks_per_robot: int):
+        self.robots = robots
+        self.max_tasks_per_robot = max_tasks_per_robot
+        self.task_counts = np.zeros(len(robots), dtype=np.int64)
+        self.grid = map_grid.grid if map_grid else None
+        self.shelf_cells = map_grid.shelf_cells if map_grid else {}
+        self.distances = {}
+        # Same order the x-sorted mode used, for shelves we cannot place on the map
+        self._fallback = sorted(range(len(robots)), key=lambda i: robots[i]["location"]["x"])
+
+    def prepare(self, shelf_ids):
+        """Robot distances for every shelf in shelf_ids that is on the map."""
+        if self.grid is None:
+            return
+        shelf_ids = [s for s in dict.fromkeys(shelf_ids) if s not in self.distances and self.shelf_cells.get(s)]
+        if not shelf_ids:
+            return
+        matrix = distance_matrix(
+            self.grid, [self.shelf_cells[s] for s in shelf_ids], [robot_cell(r) for r in self.robots]
+        )
+        self.distances.update(zip(shelf_ids, matrix))
+
+    def assign(self, shelf_id: str):
+        """Return the robot for a task on shelf_id, or None when every robot is at capacity."""
+        available = self.task_counts < self.max_tasks_per_robot
+        if not available.any():
+            return None
+        distances = self.distances.get(shelf_id)
+        reachable = available & (distances >= 0) if distances is not None else None
+        if reachable is not None and reachable.any():
+            index = int(np.argmin(np.where(reachable, distances, np.iinfo(distances.dtype).max)))
+        else:
+            # Shelf not on the map or unreachable: keep the old x-ordered choice
+            index = next(i for i in self._fallback if available[i])
+        self.task_counts[index] += 1
+        return self.robots[index]
+
+
+WAVE_BATTERY_WEIGHT = float(os.getenv("WAVE_BATTERY_WEIGHT", 0.5))  # cells of travel per % of battery used
+WAVE_LOAD_WEIGHT = float(os.getenv("WAVE_LOAD_WEIGHT", 10.0))  # cells of travel per task queued on the robot
+WAVE_HUNGARIAN_MAX_CELLS = int(os.getenv("WAVE_HUNGARIAN_MAX_CELLS", 360000))
+
+
+def wave_cost_matrix(robots, shelf_ids, map_grid, pending_load):
+    """
+    tasks x robots cost: grid distance from the robot to the task's shelf,
+    plus WAVE_BATTERY_WEIGHT per % of battery the robot has used and
+    WAVE_LOAD_WEIGHT per task it already has pending. Shelves that are not on
+    the map add no distance; unreachable ones cost more than any path.
+    """
+    cost = np.zeros((len(shelf_ids), len(robots)))
+    if map_grid:
+        cells = [map_grid.shelf_cells.get(shelf_id) for shelf_id in shelf_ids]
+        on_map = [i for i, cell in enumerate(cells) if cell]
+        if on_map:
+            # One search per distinct shelf cell, which usually means far fewer sources than robots
+            distinct = list(dict.fromkeys(cells[i] for i in on_map))
+            row_of = {cell: row for row, cell in enumerate(distinct)}
+            distances = distance_matrix(map_grid.grid, distinct, [robot_cell(r) for r in robots]).astype(float)
+            distances[distances < 0] = map_grid.grid.rows * map_grid.grid.cols
+            cost[on_map] = distances[[row_of[cells[i]] for i in on_map]]
+    battery = np.array([r.get("battery_level", 100) for r in robots], dtype=float)
+    load = np.array([pending_load.get(r["robot_id"], 0) for r in robots], dtype=float)
+    return cost + WAVE_BATTERY_WEIGHT * (100 - battery) + WAVE_LOAD_WEIGHT * load
+
+
+def assign_wave(robots, shelf_ids, map_grid, pending_load, max_tasks_per_robot: int):
+    """
+    Robot (or None) for each task of a wave, minimizing the summed cost. A
+    robot takes at most max_tasks_per_robot tasks counting those it already
+    has pending. Each extra task on a robot costs
+    WAVE_LOAD_WEIGHT more than the last, so work spreads over the fleet.
+    Solved exactly with the Hungarian algorithm up to WAVE_HUNGARIAN_MAX_CELLS
+    task x slot cells, greedily beyond. Returns (robots, method).
+    """
+    base = wave_cost_matrix(robots, shelf_ids, map_grid, pending_load)
+    capacity = [max(0, max_tasks_per_robot - pending_load.get(r["robot_id"], 0)) for r in robots]
+    if len(shelf_ids) * sum(capacity) <= WAVE_HUNGARIAN_MAX_CELLS:
+        method, assignment = "hungarian", optimal_assignment(base, capacity, WAVE_LOAD_WEIGHT)
+    else:
+        method, assignment = "greedy", greedy_assignment(base, capacity, WAVE_LOAD_WEIGHT)
+    return [robots[r] if r >= 0 else None for r in assignment], method
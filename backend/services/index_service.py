@@ -0,0 +1,108 @@
+# services/index_service.py
+from pymongo import ASCENDING
+from pymongo.errors import ConnectionFailure
+from utils.mongo_utils import (
+    putaway_orders, putaway_station, putaway_tasks, robot_status, shelf_status, sku_collection,
+    storage_collection, agv_goods_collection, shelf_status_collection
+)
+
+# (collection, keys, unique). Unique only where the services already treat the key as one:
+# robots, shelves and stations are upserted / existence-checked per (id, map_id).
+# map_id leads the compound keys so the same index also serves the "everything on a map" finds.
+INDEXES = [
+    (robot_status, [("robot_id", ASCENDING), ("map_id", ASCENDING)], True),
+    (robot_status, [("map_id", ASCENDING), ("status", ASCENDING)], False),
+    (putaway_tasks, [("map_id", ASCENDING), ("status", ASCENDING)], False),
+    (putaway_tasks, [("map_id", ASCENDING), ("_id", ASCENDING)], False),
+    (putaway_tasks, [("task_id", ASCENDING)], False),
+    (putaway_orders, [("body.orders.order_details.putaway_order_code", ASCENDING)], False),
+    (putaway_orders, [("body.orders.order_details.map_id", ASCENDING)], False),
+    (putaway_orders, [("body.orders.order_details.map_id", ASCENDING), ("status", ASCENDING)], False),
+    (sku_collection, [("body.sku_list.sku_id", ASCENDING)], False),
+    (sku_collection, [("sku_id", ASCENDING)], False),
+    (shelf_status, [("map_id", ASCENDING), ("shelf_id", ASCENDING)], True),
+    (putaway_station, [("map_id", ASCENDING), ("station_id", ASCENDING)], True),
+    (storage_collection, [("sku_id", ASCENDING)], False),
+    (agv_goods_collection, [("sku_id", ASCENDING)], False),
+    (shelf_status_collection, [("sku_id", ASCENDING)], False),
+]
+
+# Filters the services run on every request, checked by explain_query_shapes
+QUERY_SHAPES = [
+    ("robot heartbeat / add", robot_status, {"robot_id": "R1", "map_id": "M"}),
+    ("idle robots", robot_status, {"status": "idle", "map_id": "M"}),
+    ("fleet load", robot_status, {"map_id": "M"}),
+    ("tasks by map", putaway_tasks, {"map_id": "M"}),
+    ("pending tasks", putaway_tasks, {"map_id": "M", "status": "pending"}),
+    ("task status update", putaway_tasks, {"task_id": "TASK_1"}),
+    ("order by code", putaway_orders, {"body.orders.order_details.putaway_order_code": "X"}),
+    ("orders by map", putaway_orders, {"body.orders.order_details.map_id": "M"}),
+    ("pending orders for a wave", putaway_orders,
+     {"body.orders.order_details.map_id": "M", "status": {"$in": [None, "pending"]}}),
+    ("sku lookup", sku_collection, {"body.sku_list.sku_id": "SKU"}),
+    ("inventory sku duplicate check", sku_collection, {"sku_id": {"$in": ["SKU"]}}),
+    ("shelves by map", shelf_status, {"map_id": "M"}),
+    ("shelf upsert", shelf_status, {"shelf_id": "S1", "map_id": "M"}),
+    ("stations by map", putaway_station, {"map_id": "M"}),
+    ("station upsert", putaway_station, {"station_id": "ST1", "map_id": "M"}),
+]
+
+index_errors = []
+
+
+def _name(collection):
+    return f"{collection.database.name}.{collection.name}"
+
+
+async def ensure_indexes():
+    """
+    Create every index in INDEXES. create_index is a no-op when the index
+    already exists, so this runs on each startup. Failures (duplicate keys
+    blocking a unique index, an index with the same keys but other options)
+    are logged and kept in index_errors instead of stopping the app.
+    """
+    index_errors.clear()
+    for collection, keys, unique in INDEXES:
+        try:
+            await collection.create_index(keys, unique=unique)
+        except ConnectionFailure as e:
+            # Database unreachable: don't wait out a server selection timeout per index
+            index_errors.append({"collection": _name(collection), "keys": dict(keys), "error": str(e)})
+            print(f"Skipping index creation, MongoDB unreachable: {e}")
+            break
+        except Exception as e:
+            index_errors.append({"collection": _name(collection), "keys": dict(keys), "error": str(e)})
+            print(f"Error creating index {keys} on {_name(collection)}: {e}")
+    return index_errors
+
+
+def _plan_stages(plan):
+    stages = []
+    while plan:
+        stages.append(plan.get("stage"))
+        for child in plan.get("inputStages", []):
+            stages += _plan_stages(child)
+        plan = plan.get("inputStage")
+    return stages
+
+
+async def explain_query_shapes():
+    """Winning plan stages of each QUERY_SHAPES filter; collscan marks the ones still scanning."""
+    report = []
+    for label, collection, query in QUERY_SHAPES:
+        entry = {"query": label, "collection": _name(collection), "filter": list(query)}
+        try:
+            explain = await collection.find(query).explain()
+            planner = explain.get("queryPlanner", {})
+            winning = planner.get("winningPlan", {})
+            # Slot-based engine plans nest the classic tree under queryPlan
+            stages = _plan_stages(winning.get("queryPlan", winning))
+            entry.update({"stages": stages, "collscan": "COLLSCAN" in stages})
+        except Exception as e:
+            entry.update({"error": str(e)})
+        report.append(entry)
+    return {
+        "collscans": [entry for entry in report if entry.get("collscan")],
+        "queries": report,
+        "index_errors": index_errors
+    }
@@ -2,33 +2,75 @@
 # services/inventory_service.py
 from fastapi import HTTPException
 from math import floor
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
 from utils.mongo_utils import sku_collection, storage_collection, agv_goods_collection, shelf_status_collection
 from models.inventory_models import SKUSyncRequest, AGVUpdateRequest
+from services.sku_catalog_service import invalidate_sku_packing
 
 async def handle_sku_creation(data: SKUSyncRequest):
-    inserted_ids = []
-    for sku in data.body.sku_list:
-        existing = await sku_collection.find_one({"sku_id": sku.sku_id})
-        if existing:
-            raise HTTPException(status_code=400, detail=f"SKU {sku.sku_id} already exists")
-
-        result = await sku_collection.insert_one(sku.dict())
-        inserted_ids.append(str(result.inserted_id))
-
-        shelf_cursor = shelf_status_collection.find({"sku_id": sku.sku_id})
-        shelves = await shelf_cursor.to_list(length=None)
-
-        for shelf in shelves:
-            max_capacity = calculate_max_capacity(shelf, sku)
-            if max_capacity > 0:
-                shelf['sku_quantity'] += max_capacity
-                shelf['available_space'] -= max_capacity * sku.dimensions.sku_volume
-                await shelf_status_collection.update_one(
-                    {"_id": shelf["_id"]},
-                    {"$set": {"sku_quantity": shelf['sku_quantity'], "available_space": shelf['available_space']}}
-                )
-
-    return {"message": "SKU(s) created", "inserted_ids": inserted_ids}
+    skus = data.body.sku_list
+    sku_ids = [sku.sku_id for sku in skus]
+    existing = {
+        doc["sku_id"] for doc in
+        await sku_collection.find({"sku_id": {"$in": sku_ids}}, {"_id": 0, "sku_id": 1}).to_list(length=None)
+    }
+
+    results, new_skus, seen = [], [], set()
+    for sku in skus:
+        if sku.sku_id in existing or sku.sku_id in seen:
+            results.append({"sku_id": sku.sku_id, "status": "duplicate", "error": f"SKU {sku.sku_id} already exists"})
+            continue
+        seen.add(sku.sku_id)
+        results.append({"sku_id": sku.sku_id, "status": "created"})
+        new_skus.append((len(results) - 1, sku))
+
+    created = []
+    if new_skus:
+        docs = [sku.dict() for _, sku in new_skus]
+        rejected = {}
+        try:
+            await sku_collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            rejected = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+        for i, ((position, sku), doc) in enumerate(zip(new_skus, docs)):
+            if i in rejected:
+                results[position] = {"sku_id": sku.sku_id, "status": "error", "error": rejected[i]}
+            else:
+                results[position]["inserted_id"] = str(doc["_id"])
+                created.append(sku)
+
+    inserted_ids = [r["inserted_id"] for r in results if r["status"] == "created"]
+    if not created:
+        raise HTTPException(status_code=400, detail={"message": "No SKUs created", "results": results})
+    invalidate_sku_packing([sku.sku_id for sku in created])
+
+    # Fill the shelves already reserved for the new SKUs, one bulk write for all of them
+    by_id = {sku.sku_id: sku for sku in created}
+    shelves = await shelf_status_collection.find(
+        {"sku_id": {"$in": list(by_id)}}, {"sku_id": 1, "sku_quantity": 1, "available_space": 1}
+    ).to_list(length=None)
+    updates = []
+    for shelf in shelves:
+        sku = by_id[shelf["sku_id"]]
+        max_capacity = calculate_max_capacity(shelf, sku)
+        if max_capacity > 0:
+            updates.append(UpdateOne(
+                {"_id": shelf["_id"]},
+                {"$set": {
+                    "sku_quantity": shelf.get("sku_quantity", 0) + max_capacity,
+                    "available_space": shelf["available_space"] - max_capacity * sku.dimensions.sku_volume
+                }}
+            ))
+    if updates:
+        await shelf_status_collection.bulk_write(updates, ordered=False)
+
+    return {
+        "message": "SKU(s) created",
+        "inserted_ids": inserted_ids,
+        "results": results,
+        "shelves_updated": len(updates)
+    }
 
 async def get_sku_by_id(sku_id: str):
     item = await sku_collection.find_one({"sku_id": sku_id})
@@ -0,0 +1,140 @@
+# services/load_generator_service.py
+import os
+import random
+import time
+from fastapi import HTTPException
+from services.putaway_service import average_skus_per_order, working_hours
+from services.sku_catalog_service import get_sku_id_pool
+from utils.mongo_utils import putaway_orders
+
+ORDER_INSERT_BATCH_SIZE = int(os.getenv("ORDER_INSERT_BATCH_SIZE", 5000))
+LOADGEN_MAX_ORDERS = int(os.getenv("LOADGEN_MAX_ORDERS", 1000000))
+
+ORDER_CODE_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789'
+OWNERS = ["lidong", "owner2", "owner3"]
+CARRIER_CODES = ["DHL", "UPS", "FedEx"]
+CARRIER_NAMES = ["DHL Freight", "UPS Express", "FedEx Ground"]
+HEADER = {"warehouse_code": "agv-sim", "user_id": "testUser", "user_key": "111111"}
+DAY_MS = 24 * 3600 * 1000
+
+
+def arrival_times(rng: random.Random, start_ms: int, count: int = None, orders_per_hour: float = None,
+                  hours: float = None):
+    """
+    creation_date (ms) of each order. With orders_per_hour arrivals are a
+    Poisson process over hours (or until count orders), otherwise all count
+    orders arrive at start_ms.
+    """
+    if not orders_per_hour:
+        for _ in range(count):
+            yield start_ms
+        return
+    end = (hours if hours is not None else working_hours) * 3600.0
+    rate = orders_per_hour / 3600.0
+    t, produced = rng.expovariate(rate), 0
+    while t < end and (count is None or produced < count):
+        yield start_ms + int(t * 1000)
+        produced += 1
+        t += rng.expovariate(rate)
+
+
+def build_order(rng: random.Random, sku_ids, map_id: str, created_ms: int):
+    """
+    One putaway order in the stored PutawayRequest shape (the same fields and
+    value ranges as generate_putaway_order), built as plain dicts: validating
+    100k generated orders through pydantic would cost more than generating them.
+    """
+    rand = rng.random
+
+    # rng.randint costs several Python-level calls per draw; this is most of the generation time
+    def randint(low, high):
+        return low + int(rand() * (high - low + 1))
+
+    def choice(options):
+        return options[int(rand() * len(options))]
+
+    sku_items = []
+    for sku_id in rng.sample(sku_ids, min(len(sku_ids), randint(1, average_skus_per_order))):
+        sku_items.append({
+            "sku_code": f"sku{rng.getrandbits(24):06X}",
+            "sku_id": sku_id,
+            "in_batch_code": f"batch{randint(1, 100)}",
+            "sku_level": randint(0, 2),
+            "amount": randint(1, 10),
+            "production_date": created_ms if rand() < 0.5 else None,
+            "expiration_date": created_ms + randint(30, 365) * DAY_MS if rand() < 0.5 else None
+        })
+    carrier = randint(0, 2)
+    order = {
+        "order_details": {
+            "putaway_order_code": ''.join(rng.choices(ORDER_CODE_CHARS, k=8)),
+            "order_type": randint(0, 1),
+            "inbound_wave_code": f"wave_in_{randint(2020001, 2029999)}",
+            "owner_code": choice(OWNERS),
+            "map_id": map_id,
+            "print": {"type": randint(1, 2), "content": '[{"field1":"value1"}]'},
+            "carrier": {
+                "type": randint(1, 2),
+                "code": CARRIER_CODES[carrier],
+                "name": CARRIER_NAMES[carrier],
+                "waybill_code": f"D{randint(2020001, 2029999)}"
+            },
+            "dates": {
+                "creation_date": created_ms,
+                "expected_finish_date": created_ms + int(working_hours * 3600 * 1000)
+            },
+            "priority": randint(0, 1)
+        },
+        "sku_items": sku_items
+    }
+    return {"header": dict(HEADER), "body": {"orders": [order]}}
+
+
+async def generate_putaway_load(map_id: str, count: int = None, orders_per_hour: float = None,
+                                hours: float = None, seed: int = 0, start_time: int = None,
+                                batch_size: int = ORDER_INSERT_BATCH_SIZE):
+    """
+    Write a reproducible batch of putaway orders: count orders, or an arrival
+    process of orders_per_hour over hours. The same seed and start_time
+    (ms, defaults to now) produce the same orders. Orders are written with
+    insert_many in batches of batch_size.
+    """
+    if not count and not orders_per_hour:
+        raise HTTPException(status_code=400, detail="Give count or orders_per_hour")
+    if (count or 0) > LOADGEN_MAX_ORDERS:
+        raise HTTPException(status_code=400, detail=f"count is limited to {LOADGEN_MAX_ORDERS}")
+    sku_ids = await get_sku_id_pool()
+    if not sku_ids:
+        raise HTTPException(status_code=404, detail="No available SKUs found")
+
+    rng = random.Random(seed)
+    start_ms = start_time if start_time is not None else int(time.time() * 1000)
+    started = time.monotonic()
+    inserted, batch = 0, []
+    first = last = None
+    for created_ms in arrival_times(rng, start_ms, count, orders_per_hour, hours):
+        batch.append(build_order(rng, sku_ids, map_id, created_ms))
+        first = created_ms if first is None else first
+        last = created_ms
+        if len(batch) >= batch_size:
+            await putaway_orders.insert_many(batch, ordered=False)
+            inserted += len(batch)
+            batch = []
+        if inserted + len(batch) >= LOADGEN_MAX_ORDERS:
+            break
+    if batch:
+        await putaway_orders.insert_many(batch, ordered=False)
+        inserted += len(batch)
+
+    seconds = time.monotonic() - started
+    return {
+        "message": "Putaway orders generated",
+        "map_id": map_id,
+        "seed": seed,
+        "inserted": inserted,
+        "first_creation_date": first,
+        "last_creation_date": last,
+        "sku_pool_size": len(sku_ids),
+        "seconds": round(seconds, 3),
+        "orders_per_second": round(inserted / seconds) if seconds else None
+    }
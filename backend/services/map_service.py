@@ -2,29 +2,78 @@ import json
 import os
 from bson import ObjectId
 from fastapi import HTTPException, UploadFile
+from fastapi.responses import Response
 from models.map_model import MapRequest, UpdateMapRequest
+from utils.map_codec import MAP_MEDIA_TYPE, content_hash, encode_map
 from utils.mongo_utils import maps_collection
+from utils.pagination import paginate
+from utils.responses import MongoJSONResponse
+from services.pathfinding_service import invalidate_map_grid
 
+# The compact encoding is an internal copy of the components, never part of the JSON shape
+MAP_JSON_PROJECTION = {"compact": 0}
 
-# Fetch available maps
-async def get_maps_service():
-    maps_cursor = maps_collection.find({}, {"name": 1})
-    maps_list = await maps_cursor.to_list(length=100)
-    return [{"_id": str(m["_id"]), "name": m["name"]} for m in maps_list]
+
+def compact_fields(map_doc):
+    """compact (encode_map bytes) and content_hash stored next to a map's components."""
+    try:
+        compact = encode_map(map_doc)
+        return {"compact": compact, "content_hash": content_hash(compact)}
+    except ValueError:
+        # Maps with components outside the grid are only served as JSON
+        canonical = json.dumps(
+            {key: map_doc.get(key) for key in ("name", "rows", "cols", "components")}, sort_keys=True
+        )
+        return {"compact": None, "content_hash": content_hash(canonical.encode("utf-8"))}
+
+
+def _etag_matches(if_none_match: str, etag: str):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
 
 
-# Fetch map by its ID
-async def get_map_by_id_service(map_id: str):
+# Fetch available maps, one page at a time
+async def get_maps_service(cursor: str = None, limit: int = 100):
+    maps_list, next_cursor = await paginate(maps_collection, projection={"name": 1}, cursor=cursor, limit=limit)
+    return [{"_id": str(m["_id"]), "name": m["name"]} for m in maps_list], next_cursor
+
+
+# Fetch map by its ID as JSON or in the compact encoding, honouring If-None-Match
+async def get_map_response_service(map_id: str, accept: str = None, if_none_match: str = None):
     try:
         if not ObjectId.is_valid(map_id):
             raise HTTPException(status_code=400, detail="Invalid map ID format")
 
-        map_data = await maps_collection.find_one({"_id": ObjectId(map_id)})
+        want_compact = MAP_MEDIA_TYPE in (accept or "")
+        projection = {"content_hash": 1, "compact": 1} if want_compact else {"content_hash": 1}
+        meta = await maps_collection.find_one({"_id": ObjectId(map_id)}, projection)
+        if not meta:
+            raise HTTPException(status_code=404, detail="Map not found")
+        if "content_hash" not in meta:
+            # Map saved before compact encodings existed: compute it once and keep it
+            map_doc = await maps_collection.find_one({"_id": ObjectId(map_id)})
+            meta = compact_fields(map_doc)
+            await maps_collection.update_one({"_id": ObjectId(map_id)}, {"$set": meta})
+
+        etag = f'"{meta["content_hash"]}"' if want_compact else f'"{meta["content_hash"]}-json"'
+        headers = {"ETag": etag, "Vary": "Accept", "Cache-Control": "no-cache"}
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+
+        if want_compact:
+            if meta.get("compact") is None:
+                raise HTTPException(status_code=406, detail="Map has no compact encoding; request application/json")
+            return Response(content=bytes(meta["compact"]), media_type=MAP_MEDIA_TYPE, headers=headers)
+
+        map_data = await maps_collection.find_one({"_id": ObjectId(map_id)}, MAP_JSON_PROJECTION)
         if not map_data:
             raise HTTPException(status_code=404, detail="Map not found")
-
-        map_data["_id"] = str(map_data["_id"])  # Convert ObjectId to str
-        return map_data
+        return MongoJSONResponse(content=map_data, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error loading map: {e}")
         raise HTTPException(status_code=500, detail="Internal Server Error")
@@ -33,7 +82,8 @@ async def get_map_by_id_service(map_id: str):
 # Save new map data
 async def save_map_service(map_data: MapRequest):
     try:
-        result = await maps_collection.insert_one(map_data.dict())
+        doc = map_data.dict()
+        result = await maps_collection.insert_one({**doc, **compact_fields(doc)})
         return {"inserted_id": str(result.inserted_id)}
     except Exception as e:
         print(f"Error saving map: {e}")
@@ -50,11 +100,13 @@ async def update_map_service(id: str, update_data: UpdateMapRequest):
         if not map_to_update:
             raise HTTPException(status_code=404, detail="Map not found")
 
+        changes = update_data.dict(exclude_unset=True)
         result = await maps_collection.update_one(
             {"_id": ObjectId(id)},
-            {"$set": update_data.dict(exclude_unset=True)}
+            {"$set": {**changes, **compact_fields({**map_to_update, **changes})}}
         )
         if result.modified_count:
+            invalidate_map_grid(id)
             return {"message": "Map updated successfully"}
         raise HTTPException(status_code=404, detail="Map not found")
     except Exception as e:
@@ -78,10 +130,12 @@ async def upload_map_service(file: UploadFile):
             components=data["components"]
         )
 
-        result = await maps_collection.insert_one(map_data.dict())
+        doc = map_data.dict()
+        result = await maps_collection.insert_one({**doc, **compact_fields(doc)})
         inserted_map_id = result.inserted_id
+        invalidate_map_grid(inserted_map_id)
 
-        inserted_map = await maps_collection.find_one({"_id": inserted_map_id})
+        inserted_map = await maps_collection.find_one({"_id": inserted_map_id}, MAP_JSON_PROJECTION)
         if not inserted_map:
             raise HTTPException(status_code=500, detail="Failed to retrieve inserted map")
 
@@ -102,7 +156,7 @@ async def upload_map_service(file: UploadFile):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 async def get_latest_map_id():
-    latest_map = await maps_collection.find().sort("_id", -1).limit(1).to_list(1)
+    latest_map = await maps_collection.find({}, {"_id": 1}).sort("_id", -1).limit(1).to_list(1)
     if not latest_map:
         raise HTTPException(status_code=404, detail="No maps found")
     return {"latest_id": str(latest_map[0]["_id"])}
\ No newline at end of file
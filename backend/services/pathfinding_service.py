@@ -0,0 +1,74 @@
+# services/pathfinding_service.py
+import os
+from collections import OrderedDict
+from bson import ObjectId
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from utils.mongo_utils import maps_collection
+from utils.pathfinding import build_occupancy_grid, component_positions, find_path
+
+MAP_GRID_CACHE_SIZE = int(os.getenv("MAP_GRID_CACHE_SIZE", 32))
+
+
+class MapGrid:
+    """Compiled form of a stored map: occupancy grid plus generated-id -> cell lookups."""
+
+    def __init__(self, map_doc):
+        self.grid = build_occupancy_grid(map_doc)
+        self.shelf_cells = component_positions(map_doc, "Shelf", "S")
+        self.station_cells = component_positions(map_doc, "Station", "ST")
+        self.robot_cells = component_positions(map_doc, "Robot", "R")
+
+
+_map_grids = OrderedDict()
+
+
+def invalidate_map_grid(map_id: str = None):
+    if map_id is None:
+        _map_grids.clear()
+    else:
+        _map_grids.pop(str(map_id), None)
+
+
+# Compiled grid for a map, loaded and cached on first use; None if the map does not exist
+async def get_map_grid(map_id: str):
+    if map_id in _map_grids:
+        _map_grids.move_to_end(map_id)
+        return _map_grids[map_id]
+    if not ObjectId.is_valid(map_id):
+        return None
+    map_doc = await maps_collection.find_one({"_id": ObjectId(map_id)}, {"rows": 1, "cols": 1, "components": 1})
+    if not map_doc:
+        return None
+    map_grid = MapGrid(map_doc)
+    _map_grids[map_id] = map_grid
+    while len(_map_grids) > MAP_GRID_CACHE_SIZE:
+        _map_grids.popitem(last=False)
+    return map_grid
+
+
+def solve_paths(grid, queries):
+    solved = {}
+    paths = []
+    for query in queries:
+        key = (query.start.row, query.start.col, query.goal.row, query.goal.col)
+        if key not in solved:
+            solved[key] = find_path(grid, key[:2], key[2:])
+        path = solved[key]
+        paths.append({
+            "start": query.start.dict(),
+            "goal": query.goal.dict(),
+            "length": len(path) - 1 if path else None,
+            "path": [{"row": row, "col": col} for row, col in path]
+        })
+    return paths
+
+
+# Answer many start/goal queries against one map's cached grid
+async def plan_paths_service(map_id: str, queries):
+    map_grid = await get_map_grid(map_id)
+    if map_grid is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+    # The searches are CPU-bound; off the event loop they do not stall other requests or the SSE streams
+    paths = await run_in_threadpool(solve_paths, map_grid.grid, queries)
+    return {"map_id": map_id, "paths": paths}
@@ -2,23 +2,16 @@
 import random, uuid, time
 from datetime import datetime, timedelta
 from fastapi import HTTPException
-import httpx
 from models.putaway_models import PutawayRequest, PutawayHeader, PutawayBody
+from services.sku_catalog_service import get_sku_id_pool
 
 average_skus_per_order = 5
 working_hours = 9
 
 async def fetch_available_skus():
+    # Cached catalog pool; only reloaded after SKUs are added
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("http://localhost:8000/get-all-skus")
-            if response.status_code != 200:
-                raise HTTPException(status_code=response.status_code, detail="Error fetching SKUs")
-            data = response.json()
-            sku_ids = [sku.get("sku_id") for sku_entry in data.get("skus", [])
-                       for sku in sku_entry.get("body", {}).get("sku_list", [])
-                       if sku.get("sku_id")]
-            return sku_ids
+        return list(await get_sku_id_pool())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching SKUs: {str(e)}")
 
@@ -1,21 +1,222 @@
+import asyncio
+import os
+import time
+import numpy as np
+from typing import List
+from pymongo import UpdateOne
 from models.robot_model import RobotHeartbeat
+from services.stream_service import stream_hub
+from utils.fleet_state import FleetState, BUSY, IDLE, STATUSES
 from utils.mongo_utils import robot_status
 
+FLEET_SYNC_BATCH_SIZE = int(os.getenv("FLEET_SYNC_BATCH_SIZE", 1000))
+FLEET_FLUSH_INTERVAL = float(os.getenv("FLEET_FLUSH_INTERVAL", 1.0))
+FLEET_RELOAD_INTERVAL = float(os.getenv("FLEET_RELOAD_INTERVAL", 5.0))
+
 async def update_robot(data: RobotHeartbeat):
-    await robot_status.update_one(
-        {"robot_id": data.robot_id, "map_id": data.map_id},
-        {"$set": data.dict()},
-        upsert=True
-    )
+    await fleet_store.apply_heartbeats([data.dict()])
     return {"message": "Robot status updated"}
 
+async def update_robots_batch(heartbeats: List[RobotHeartbeat]):
+    count = await fleet_store.apply_heartbeats([hb.dict() for hb in heartbeats])
+    return {"message": "Robot statuses updated", "count": count}
+
 async def get_idle_robots_by_map(map_id: str):
-    robots = await robot_status.find({"status": {"$in": ["idle"]}, "map_id": map_id}).to_list(length=None)
-    return {"robots": robots}
+    fleet = await fleet_store.get(map_id)
+    return {"robots": fleet.to_docs(fleet.rows_with_status(IDLE))}
+
+async def get_fleet_snapshot(map_id: str):
+    fleet = await fleet_store.get(map_id)
+    return {"robots": [robot_delta(doc) for doc in fleet.to_docs()]}
+
+def idle_robot_counts():
+    """Idle robots per map, for the maps the fleet store has loaded."""
+    return {map_id: len(fleet.rows_with_status(IDLE)) for map_id, fleet in fleet_store.fleets.items()}
+
+def robot_delta(doc):
+    return {"robot_id": doc["robot_id"], "status": doc["status"], "location": doc["location"]}
 
 async def add_robot(data: RobotHeartbeat):
     existing = await robot_status.find_one({"robot_id": data.robot_id, "map_id": data.map_id})
     if existing:
         return {"error": "Robot already exists for this map"}
     await robot_status.insert_one(data.dict())
+    fleet_store.remember(data.dict())
     return {"message": "Robot added successfully"}
+
+async def load_fleet_docs(map_id: str):
+    # One query for the whole map instead of a find_one per robot
+    return await robot_status.find(
+        {"map_id": map_id},
+        {"_id": 0, "robot_id": 1, "status": 1, "location": 1, "map_id": 1, "battery_level": 1}
+    ).to_list(length=None)
+
+async def load_fleet_state(map_id: str, **kwargs):
+    return FleetState.from_docs(await load_fleet_docs(map_id), **kwargs)
+
+async def save_fleet_state(fleet: FleetState, rows=None, batch_size: int = FLEET_SYNC_BATCH_SIZE):
+    """Write robots back as RobotHeartbeat documents in bulk_write batches; only changed rows by default."""
+    if rows is None:
+        rows = fleet.take_dirty()
+    docs = fleet.to_docs(rows)
+    written = 0
+    try:
+        for i in range(0, len(docs), batch_size):
+            ops = [
+                UpdateOne({"robot_id": doc["robot_id"], "map_id": doc["map_id"]}, {"$set": doc}, upsert=True)
+                for doc in docs[i:i + batch_size]
+            ]
+            await robot_status.bulk_write(ops, ordered=False)
+            written += len(ops)
+    except Exception:
+        # Rows that were not written stay dirty so the next flush retries them
+        fleet.dirty[rows[written:]] = True
+        raise
+    return written
+
+
+class FleetStore:
+    """
+    In-memory FleetState per map with write-behind to robot_status.
+
+    Heartbeats only touch the arrays. A background task flushes the rows that
+    changed every FLEET_FLUSH_INTERVAL seconds, so any number of heartbeats for
+    a robot in between costs one upsert. A map is loaded from robot_status the
+    first time it is used and reloaded once it is FLEET_RELOAD_INTERVAL seconds
+    old, which picks up writes made by other workers or outside the heartbeat
+    path. Robots with heartbeats not flushed yet keep their in-memory state.
+    Robots given a route by dispatch() are advanced along it on every flush
+    tick, one cell per second.
+    """
+
+    def __init__(self):
+        self.fleets = {}
+        self._loaded_at = {}
+        self._loading = {}
+        self._flusher = None
+        self._flushing = False
+        self._flushes = 0
+
+    async def get(self, map_id: str):
+        fleet = self.fleets.get(map_id)
+        if fleet is not None and time.monotonic() - self._loaded_at.get(map_id, 0) < FLEET_RELOAD_INTERVAL:
+            return fleet
+        if map_id not in self._loading:
+            self._loading[map_id] = asyncio.ensure_future(self._load(map_id))
+        try:
+            return await self._loading[map_id]
+        finally:
+            self._loading.pop(map_id, None)
+
+    async def _load(self, map_id: str):
+        flushes, flushing = self._flushes, self._flushing
+        docs = await load_fleet_docs(map_id)
+        fleet = self.fleets.get(map_id)
+        if fleet is None:
+            self._loaded_at[map_id] = time.monotonic()
+            return self.fleets.setdefault(map_id, FleetState.from_docs(docs))
+        if flushing or flushes != self._flushes:
+            # A flush overlapped the read, which may predate rows it wrote; retry on the next get
+            return fleet
+        self._loaded_at[map_id] = time.monotonic()
+        pending = {fleet.ids[row] for row in np.flatnonzero(fleet.dirty)}
+        docs = [doc for doc in docs if doc["robot_id"] not in pending]
+        if map_id in stream_hub.subscribers:
+            stream_hub.publish_many(map_id, "robots", self._changed(fleet, docs))
+        fleet.upsert_docs(docs, mark_dirty=False)
+        return fleet
+
+    async def apply_heartbeats(self, docs):
+        by_map = {}
+        for doc in docs:
+            by_map.setdefault(doc["map_id"], []).append(doc)
+        for map_id, map_docs in by_map.items():
+            fleet = await self.get(map_id)
+            if map_id in stream_hub.subscribers:
+                stream_hub.publish_many(map_id, "robots", self._changed(fleet, map_docs))
+            fleet.upsert_docs(map_docs)
+        return len(docs)
+
+    @staticmethod
+    def _changed(fleet: FleetState, docs):
+        """Deltas for the robots whose status or location differs from what the fleet holds."""
+        changed = []
+        for doc in docs:
+            row = fleet.index.get(doc["robot_id"])
+            location = doc["location"]
+            if (row is None or STATUSES[fleet.status[row]] != doc["status"]
+                    or fleet.position[row, 0] != location["x"] or fleet.position[row, 1] != location["y"]):
+                changed.append(robot_delta(doc))
+        return changed
+
+    async def dispatch(self, map_id: str, routes):
+        """Start robots along (robot_id, cells) routes, one cell per second; returns how many were started."""
+        fleet = await self.get(map_id)
+        routes = [(robot_id, cells) for robot_id, cells in routes if robot_id in fleet.index]
+        if routes:
+            fleet.assign_paths([robot_id for robot_id, _ in routes], [cells for _, cells in routes])
+        return len(routes)
+
+    def step(self, dt: float):
+        """Advance every dispatched robot by dt seconds and publish the ones that moved."""
+        for map_id, fleet in list(self.fleets.items()):
+            moving = np.flatnonzero((fleet.path_len > 0) & (fleet.status == BUSY))
+            if not len(moving):
+                continue
+            fleet.step(dt)
+            if map_id in stream_hub.subscribers:
+                stream_hub.publish_many(map_id, "robots", [robot_delta(doc) for doc in fleet.to_docs(moving)])
+
+    def remember(self, doc):
+        """Record a robot already written to robot_status, if its map is loaded."""
+        fleet = self.fleets.get(doc["map_id"])
+        if fleet is not None:
+            fleet.upsert_docs([doc], mark_dirty=False)
+            stream_hub.publish(doc["map_id"], "robots", robot_delta(doc))
+
+    async def flush(self):
+        written = 0
+        self._flushes += 1
+        self._flushing = True
+        try:
+            for fleet in list(self.fleets.values()):
+                written += await save_fleet_state(fleet)
+        finally:
+            self._flushing = False
+            self._flushes += 1
+        return written
+
+    async def reload_stale(self):
+        """Reload every loaded map older than FLEET_RELOAD_INTERVAL, so the idle gauge follows the database."""
+        for map_id in list(self.fleets):
+            await self.get(map_id)
+
+    async def _run(self, interval: float):
+        last = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            try:
+                self.step(now - last)
+                await self.flush()
+                await self.reload_stale()
+            except Exception as e:
+                print(f"Fleet flush failed: {e}")
+            last = now
+
+    def start(self, interval: float = FLEET_FLUSH_INTERVAL):
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+
+fleet_store = FleetStore()
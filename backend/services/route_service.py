@@ -0,0 +1,88 @@
+# services/route_service.py
+import asyncio
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from services.pathfinding_service import get_map_grid
+from services.robot_service import fleet_store
+from utils.mongo_utils import putaway_tasks, robot_status
+from utils.multi_agent import plan_prioritized
+
+
+def build_agents(map_grid, robots, tasks):
+    """
+    One agent per robot on the map. A robot with pending tasks visits, per task,
+    its shelf, the station and the shelf again (returning the rack), then drives
+    back to where it started; robots without tasks stay where they are.
+    Robots whose stored location is off the map's grid are left out and
+    returned in off_grid, their tasks in skipped.
+    """
+    tasks_by_robot = {}
+    for task in tasks:
+        tasks_by_robot.setdefault(task["robot_id"], []).append(task)
+
+    agents, task_ids, skipped, off_grid = [], {}, [], []
+    for robot in robots:
+        start = (robot["location"]["x"], robot["location"]["y"])
+        if not map_grid.grid.in_bounds(*start):
+            off_grid.append(robot["robot_id"])
+            continue
+        waypoints = []
+        task_ids[robot["robot_id"]] = []
+        for task in tasks_by_robot.pop(robot["robot_id"], []):
+            shelf = map_grid.shelf_cells.get(task["shelf_id"])
+            station = map_grid.station_cells.get(task["station_id"])
+            if not shelf or not station:
+                skipped.append(task["task_id"])
+                continue
+            waypoints += [shelf, station, shelf]
+            task_ids[robot["robot_id"]].append(task["task_id"])
+        if waypoints:
+            waypoints.append(start)
+        agents.append((robot["robot_id"], start, waypoints))
+
+    # Tasks whose robot is not on this map (or off its grid)
+    skipped += [task["task_id"] for robot_tasks in tasks_by_robot.values() for task in robot_tasks]
+    return agents, task_ids, skipped, off_grid
+
+
+async def plan_routes_service(map_id: str, max_steps: int = None, dispatch: bool = False):
+    map_grid = await get_map_grid(map_id)
+    if map_grid is None:
+        raise HTTPException(status_code=404, detail="Map not found")
+
+    robots, tasks = await asyncio.gather(
+        robot_status.find({"map_id": map_id}, {"_id": 0, "robot_id": 1, "location": 1}).to_list(length=None),
+        putaway_tasks.find(
+            {"map_id": map_id, "status": "pending"},
+            {"_id": 0, "task_id": 1, "robot_id": 1, "shelf_id": 1, "station_id": 1}
+        ).to_list(length=None),
+    )
+    if not robots:
+        raise HTTPException(status_code=404, detail="No robots found for this map")
+
+    agents, task_ids, skipped, off_grid = build_agents(map_grid, robots, tasks)
+    paths, unplanned = await run_in_threadpool(plan_prioritized, map_grid.grid, agents, max_steps)
+
+    # Robots with work start driving their routes in the fleet store; the rest stay put
+    dispatched = 0
+    if dispatch:
+        dispatched = await fleet_store.dispatch(
+            map_id, [(robot_id, paths[robot_id]) for robot_id, _, _ in agents if task_ids[robot_id]]
+        )
+
+    return {
+        "map_id": map_id,
+        "makespan": max((len(path) for path in paths.values()), default=1) - 1,
+        "routes": [
+            {
+                "robot_id": robot_id,
+                "task_ids": task_ids[robot_id],
+                "path": [[row, col] for row, col in paths[robot_id]]  # cell at t = 0, 1, 2, ...
+            }
+            for robot_id, _, _ in agents
+        ],
+        "unplanned": unplanned,
+        "skipped_tasks": skipped,
+        "skipped_robots": off_grid,
+        "dispatched": dispatched
+    }
@@ -1,7 +1,11 @@
 # services/shelf_service.py
 
-from utils.mongo_utils import serialize_dict, shelf_status  # Import utility functions and collections
+from pymongo import UpdateOne
+from utils.mongo_utils import field_projection, shelf_status  # Import utility functions and collections
 from models.shelf_model import ShelfStatusUpdate
+from utils.pagination import paginate
+
+SHELF_FIELDS = ["shelf_id", "map_id", "shelf_capacity", "available_space", "shelf_levels"]
 
 async def update_shelf(data: ShelfStatusUpdate):
     update_data = {
@@ -23,6 +27,74 @@ async def add_shelf(data: ShelfStatusUpdate):
     await shelf_status.insert_one(data.dict())
     return True
 
-async def get_shelves():
-    shelves_cursor = shelf_status.find()
-    return serialize_dict(await shelves_cursor.to_list(length=None))
+async def get_shelves(cursor: str = None, limit: int = 100, fields: str = None):
+    return await paginate(shelf_status, projection=field_projection(SHELF_FIELDS, fields), cursor=cursor, limit=limit)
+
+def _reservation_entry(task):
+    return {"task_id": task["task_id"], "sku_id": task["sku_id"], "amount": task["amount"]}
+
+async def reserve_shelf_space(map_id: str, tasks, space):
+    """
+    Take space[task_id] off each task's shelf level, atomically per level.
+    Each update only applies while the level still has that much available
+    (a conditional $inc), so concurrent generators cannot overbook a level.
+    Tasks on one level are reserved together in a single update, and every
+    reservation is recorded in the level's reservations array by task_id.
+    Returns the tasks whose level no longer had room.
+    """
+    groups = {}
+    for task in tasks:
+        groups.setdefault((task["shelf_id"], task["level"]), []).append(task)
+    if not groups:
+        return []
+    ops = []
+    for (shelf_id, level), level_tasks in groups.items():
+        needed = sum(space[task["task_id"]] for task in level_tasks)
+        ops.append(UpdateOne(
+            {"shelf_id": shelf_id, "map_id": map_id, f"shelf_levels.{level}.available_space": {"$gte": needed}},
+            {
+                "$inc": {f"shelf_levels.{level}.available_space": -needed, "available_space": -needed},
+                "$push": {f"shelf_levels.{level}.reservations": {"$each": [_reservation_entry(t) for t in level_tasks]}}
+            }
+        ))
+    result = await shelf_status.bulk_write(ops, ordered=False)
+    if result.matched_count == len(ops):
+        return []
+    # The bulk result only has counts: find the levels that carry our task ids
+    docs = await shelf_status.find(
+        {"map_id": map_id, "shelf_id": {"$in": list({shelf_id for shelf_id, _ in groups})}},
+        {"_id": 0, "shelf_id": 1, "shelf_levels": 1}
+    ).to_list(length=None)
+    reserved = set()
+    for doc in docs:
+        for level in (doc.get("shelf_levels") or {}).values():
+            reserved.update(entry.get("task_id") for entry in (level or {}).get("reservations", []))
+    return [task for task in tasks if task["task_id"] not in reserved]
+
+async def settle_shelf_reservation(map_id: str, task):
+    """The task's units are on the shelf: its reservation becomes a sku_details entry and the space stays taken."""
+    level = task["level"]
+    await shelf_status.update_one(
+        {"shelf_id": task["shelf_id"], "map_id": map_id, f"shelf_levels.{level}.reservations.task_id": task["task_id"]},
+        {
+            "$pull": {f"shelf_levels.{level}.reservations": {"task_id": task["task_id"]}},
+            "$push": {f"shelf_levels.{level}.sku_details": {task["sku_id"]: task["amount"]}}
+        }
+    )
+
+async def release_shelf_space(map_id: str, tasks, space):
+    """Give back the space reserve_shelf_space took for tasks; tasks without a reservation are skipped."""
+    if not tasks:
+        return
+    await shelf_status.bulk_write([
+        UpdateOne(
+            {"shelf_id": task["shelf_id"], "map_id": map_id, f"shelf_levels.{task['level']}.reservations.task_id": task["task_id"]},
+            {
+                "$inc": {
+                    f"shelf_levels.{task['level']}.available_space": space[task["task_id"]],
+                    "available_space": space[task["task_id"]]
+                },
+                "$pull": {f"shelf_levels.{task['level']}.reservations": {"task_id": task["task_id"]}}
+            }
+        ) for task in tasks
+    ], ordered=False)
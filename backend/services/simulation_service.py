@@ -0,0 +1,136 @@
+# services/simulation_service.py
+import asyncio
+import time
+from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
+from services.pathfinding_service import get_map_grid
+from services.putaway_service import working_hours
+from services.sku_catalog_service import get_sku_packing_batch
+from utils.mongo_utils import putaway_orders, putaway_tasks, robot_status, shelf_status, putaway_station
+from utils.pathfinding import grid_distance
+from utils.shelf_index import ShelfBinPacker
+from utils.simulation import PutawaySimulation, SimRobot, SimStation
+
+
+def make_travel_time(map_grid, robot_speed: float):
+    """Seconds between two cells at robot_speed cells/s, using memoized grid distances."""
+    distances = {}
+
+    def travel_time(a, b):
+        if a == b:
+            return 0.0
+        key = (a, b) if a <= b else (b, a)
+        if key not in distances:
+            distance = grid_distance(map_grid.grid, a, b) if map_grid else None
+            distances[key] = distance if distance is not None else abs(a[0] - b[0]) + abs(a[1] - b[1])
+        return distances[key] / robot_speed
+
+    return travel_time
+
+
+def station_cell(station, station_cells):
+    """The station's cell on the map, else its stored location; (0, 0) when it has neither."""
+    location = station.get("location") or {}
+    return station_cells.get(station["station_id"]) or (int(location.get("x", 0)), int(location.get("y", 0)))
+
+
+def make_order_planner(shelves, sku_packing):
+    """Turn an arriving order into shelf-level tasks the same way generate_putaway_tasks places units."""
+    packer = ShelfBinPacker(shelves)
+
+    def plan_order(order):
+        code = order.get("order_details", {}).get("putaway_order_code")
+        tasks, unplaced = [], 0
+        lines = []
+        for sku in order.get("sku_items", []):
+            dims = sku_packing.get(sku["sku_id"])
+            if not dims or not dims["volume"]:
+                unplaced += sku["amount"]
+            else:
+                lines.append(sku)
+        packed = packer.pack([
+            (sku["amount"], sku_packing[sku["sku_id"]]["volume"], sku_packing[sku["sku_id"]]["height"]) for sku in lines
+        ])
+        for sku, (placements, left) in zip(lines, packed):
+            unplaced += left
+            for shelf_pos, level_name, units in placements:
+                tasks.append({
+                    "task_id": f"SIM_{code}_{len(tasks) + 1}",
+                    "putaway_order_code": code,
+                    "shelf_id": packer.shelf(shelf_pos)["shelf_id"],
+                    "level": level_name,
+                    "sku_id": sku["sku_id"],
+                    "amount": units
+                })
+        return tasks, unplaced
+
+    return plan_order
+
+
+async def load_simulation_state(map_id: str):
+    map_grid, robots, stations, shelves, tasks, order_docs = await asyncio.gather(
+        get_map_grid(map_id),
+        robot_status.find({"map_id": map_id}).to_list(length=None),
+        putaway_station.find({"map_id": map_id}).to_list(length=None),
+        shelf_status.find({"map_id": map_id}).to_list(length=None),
+        putaway_tasks.find({"map_id": map_id}).to_list(length=None),
+        putaway_orders.find({"body.orders.order_details.map_id": map_id}, {"body.orders": 1}).to_list(length=None),
+    )
+    orders = [
+        order for doc in order_docs for order in doc.get("body", {}).get("orders", [])
+        if order.get("order_details", {}).get("map_id") == map_id
+    ]
+    return map_grid, robots, stations, shelves, tasks, orders
+
+
+async def run_simulation_service(map_id: str, hours: float = None, robot_speed: float = 1.0,
+                                 service_time_base: float = 10.0, service_time_per_unit: float = 2.0):
+    started = time.perf_counter()
+    map_grid, robots, stations, shelves, tasks, orders = await load_simulation_state(map_id)
+    if not robots:
+        raise HTTPException(status_code=404, detail="No robots found for this map")
+    if not stations:
+        raise HTTPException(status_code=404, detail="No stations found")
+
+    sku_packing = await get_sku_packing_batch({sku["sku_id"] for order in orders for sku in order.get("sku_items", [])})
+
+    shelf_cells = map_grid.shelf_cells if map_grid else {}
+    station_cells = map_grid.station_cells if map_grid else {}
+    sim = PutawaySimulation(
+        robots=[SimRobot(r["robot_id"], (r["location"]["x"], r["location"]["y"])) for r in robots],
+        stations=[
+            SimStation(
+                s["station_id"],
+                station_cell(s, station_cells),
+                s.get("queue_length", 0)
+            )
+            for s in stations
+        ],
+        shelf_cells=shelf_cells,
+        travel_time=make_travel_time(map_grid, robot_speed),
+        service_time_base=service_time_base,
+        service_time_per_unit=service_time_per_unit,
+        plan_order=make_order_planner(shelves, sku_packing)
+    )
+
+    # Pending tasks are ready at the start of the shift; orders that already have tasks are not planned again
+    planned_codes = {task.get("putaway_order_code") for task in tasks}
+    for task in tasks:
+        if task.get("status") == "pending":
+            sim.add_task(task)
+
+    # Orders arrive at their creation_date (ms) relative to the earliest one; undated orders at the start
+    arrivals = [
+        (order.get("order_details", {}).get("dates", {}).get("creation_date"), order)
+        for order in orders
+        if order.get("order_details", {}).get("putaway_order_code") not in planned_codes
+    ]
+    shift_start = min((created for created, _ in arrivals if created), default=0)
+    for created, order in arrivals:
+        sim.add_order(order, (created - shift_start) / 1000 if created else 0.0)
+
+    hours = hours or working_hours
+    summary = await run_in_threadpool(sim.run, hours * 3600)
+    summary["map_id"] = map_id
+    summary["wall_seconds"] = time.perf_counter() - started
+    return summary
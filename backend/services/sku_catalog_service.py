@@ -0,0 +1,106 @@
+# services/sku_catalog_service.py
+import os
+from collections import OrderedDict
+from utils.mongo_utils import sku_collection
+from utils.pagination import MAX_PAGE_SIZE, paginate
+
+SKU_CACHE_SIZE = int(os.getenv("SKU_CACHE_SIZE", 10000))
+
+
+class SkuPackingCache:
+    """Bounded LRU of sku_id -> primary packing {"volume", "height"} (None when the SKU has no primary packing)."""
+
+    def __init__(self, maxsize: int = SKU_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get_many(self, sku_ids):
+        hits = {}
+        for sku_id in sku_ids:
+            if sku_id in self._entries:
+                self._entries.move_to_end(sku_id)
+                hits[sku_id] = self._entries[sku_id]
+        return hits
+
+    def put_many(self, packing):
+        for sku_id, dims in packing.items():
+            self._entries[sku_id] = dims
+            self._entries.move_to_end(sku_id)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, sku_ids=None):
+        if sku_ids is None:
+            self._entries.clear()
+            return
+        for sku_id in sku_ids:
+            self._entries.pop(sku_id, None)
+
+
+sku_packing_cache = SkuPackingCache()
+
+# Every catalog sku_id, loaded once and dropped whenever SKUs are added
+_sku_id_pool = None
+
+
+def invalidate_sku_packing(sku_ids=None):
+    global _sku_id_pool
+    sku_packing_cache.invalidate(sku_ids)
+    _sku_id_pool = None
+
+
+async def get_sku_id_pool():
+    """Catalog sku_ids (body.sku_list entries) as a tuple, walked page by page on the first call and cached."""
+    global _sku_id_pool
+    if _sku_id_pool is None:
+        sku_ids, cursor = [], None
+        while True:
+            page, cursor = await paginate(
+                sku_collection, projection={"body.sku_list.sku_id": 1}, cursor=cursor, limit=MAX_PAGE_SIZE
+            )
+            sku_ids += [sku.get("sku_id") for sku_entry in page
+                        for sku in sku_entry.get("body", {}).get("sku_list", [])
+                        if sku.get("sku_id")]
+            if cursor is None:
+                break
+        _sku_id_pool = tuple(sku_ids)
+    return _sku_id_pool
+
+
+# Resolve the primary packing of many SKUs; cache misses are fetched in one aggregation
+async def get_sku_packing_batch(sku_ids):
+    wanted = list(dict.fromkeys(sku_ids))
+    packing = sku_packing_cache.get_many(wanted)
+    missing = [sku_id for sku_id in wanted if sku_id not in packing]
+    if not missing:
+        return packing
+
+    rows = await sku_collection.aggregate([
+        {"$match": {"body.sku_list.sku_id": {"$in": missing}}},
+        {"$unwind": "$body.sku_list"},
+        {"$match": {"body.sku_list.sku_id": {"$in": missing}}},
+        {"$project": {
+            "_id": 0,
+            "sku_id": "$body.sku_list.sku_id",
+            "primary": {"$arrayElemAt": ["$body.sku_list.sku_packing.primary", 0]}
+        }},
+        {"$project": {
+            "sku_id": 1,
+            "volume": "$primary.sku_packing_volume",
+            "height": "$primary.sku_packing_height"
+        }}
+    ]).to_list(length=None)
+
+    fetched = {}
+    for row in rows:
+        # The first document listing a SKU wins, as with find_one
+        if row["sku_id"] in fetched:
+            continue
+        if "volume" not in row and "height" not in row:
+            fetched[row["sku_id"]] = None
+        else:
+            fetched[row["sku_id"]] = {"volume": row.get("volume", 0.0), "height": row.get("height", 0.0)}
+
+    sku_packing_cache.put_many(fetched)
+    packing.update(fetched)
+    return packing
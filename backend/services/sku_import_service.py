@@ -0,0 +1,186 @@
+# services/sku_import_service.py
+import codecs
+import csv
+import json
+import os
+import time
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
+from models.inventory_models import SKUItem
+from services.sku_catalog_service import invalidate_sku_packing
+from utils.mongo_utils import sku_collection
+
+SKU_IMPORT_BATCH_SIZE = int(os.getenv("SKU_IMPORT_BATCH_SIZE", 1000))
+
+
+async def _lines(chunks):
+    """Decoded text lines from a byte stream, without holding more than one partial line."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.rstrip("\r")
+
+
+def _cell(value: str):
+    value = value.strip()
+    if value[:1] in ("[", "{"):
+        return json.loads(value)
+    return value
+
+
+def _listify(node):
+    if not isinstance(node, dict):
+        return node
+    node = {key: _listify(value) for key, value in node.items()}
+    if node and all(key.isdigit() for key in node):
+        return [node[key] for key in sorted(node, key=int)]
+    return node
+
+
+def _unflatten(row: dict):
+    """
+    CSV columns name nested fields with dots (dimensions.sku_volume,
+    sku_packing.0.primary.sku_packing_volume); numeric parts become list
+    positions. Empty cells are left out and cells holding a JSON array or
+    object are decoded.
+    """
+    doc = {}
+    for column, value in row.items():
+        if column is None or value is None or value.strip() == "":
+            continue
+        *parents, leaf = column.strip().split(".")
+        node = doc
+        for part in parents:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                raise ValueError(f"Column {column} conflicts with another column")
+        node[leaf] = _cell(value)
+    return _listify(doc)
+
+
+async def _ndjson_rows(chunks):
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        if not line.strip():
+            continue
+        try:
+            yield line_no, json.loads(line), None
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"Invalid JSON: {e}"
+
+
+async def _csv_rows(chunks):
+    header, record, start = None, "", 0
+    line_no = 0
+    async for line in _lines(chunks):
+        line_no += 1
+        record = f"{record}\n{line}" if record else line
+        start = start or line_no
+        # A quoted field with a line break leaves an odd number of quotes; wait for the rest
+        if record.count('"') % 2:
+            continue
+        text, record, record_line, start = record, "", start, 0
+        if not text.strip():
+            continue
+        values = next(csv.reader([text]))
+        if header is None:
+            header = values
+            continue
+        try:
+            yield record_line, _unflatten(dict(zip(header, values))), None
+        except (ValueError, json.JSONDecodeError) as e:
+            yield record_line, None, f"Invalid CSV row: {e}"
+    if record:
+        yield start, None, "Unterminated quoted field"
+
+
+def _validate(batch):
+    valid, errors = [], []
+    for line_no, row in batch:
+        try:
+            valid.append(SKUItem(**row).dict())
+        except (ValidationError, TypeError) as e:
+            errors.append({"line": line_no, "sku_id": row.get("sku_id") if isinstance(row, dict) else None,
+                           "error": str(e)})
+    return valid, errors
+
+
+async def _write_batch(batch_no: int, skus):
+    """One sku_list document per batch, the same shape /save-sku/ stores; SKUs already in the catalog are skipped."""
+    ids = [sku["sku_id"] for sku in skus]
+    existing = set()
+    cursor = sku_collection.find(
+        {"$or": [{"body.sku_list.sku_id": {"$in": ids}}, {"sku_id": {"$in": ids}}]},
+        {"_id": 0, "sku_id": 1, "body.sku_list.sku_id": 1}
+    )
+    async for doc in cursor:
+        existing.add(doc.get("sku_id"))
+        existing.update(item.get("sku_id") for item in doc.get("body", {}).get("sku_list", []))
+
+    fresh, errors, seen = [], [], set()
+    for sku in skus:
+        if sku["sku_id"] in existing or sku["sku_id"] in seen:
+            errors.append({"sku_id": sku["sku_id"], "error": f"SKU {sku['sku_id']} already exists"})
+            continue
+        seen.add(sku["sku_id"])
+        fresh.append(sku)
+    if fresh:
+        await sku_collection.insert_one({
+            "header": {"source": "sku_import", "batch": batch_no},
+            "body": {"sku_amount": len(fresh), "sku_list": fresh}
+        })
+        invalidate_sku_packing([sku["sku_id"] for sku in fresh])
+    return len(fresh), errors
+
+
+async def import_skus_stream(chunks, fmt: str = "ndjson", batch_size: int = SKU_IMPORT_BATCH_SIZE):
+    """
+    Import SKUs from an NDJSON or CSV byte stream, yielding one NDJSON progress
+    line per batch and a final summary. The next chunk of the body is only read
+    once the current batch is validated and written, so a fast client is held
+    back by the database instead of filling memory.
+    """
+    rows = _csv_rows(chunks) if fmt == "csv" else _ndjson_rows(chunks)
+    totals = {"rows": 0, "inserted": 0, "failed": 0, "batches": 0}
+    started = time.monotonic()
+    batch, parse_errors = [], []
+
+    async def flush():
+        valid, errors = await run_in_threadpool(_validate, batch)
+        errors = parse_errors + errors
+        inserted = 0
+        if valid:
+            inserted, duplicates = await _write_batch(totals["batches"] + 1, valid)
+            errors += duplicates
+        totals["batches"] += 1
+        totals["inserted"] += inserted
+        totals["failed"] += len(errors)
+        batch.clear()
+        parse_errors.clear()
+        return json.dumps({
+            "batch": totals["batches"],
+            "rows": totals["rows"],
+            "inserted": totals["inserted"],
+            "failed": totals["failed"],
+            "errors": errors
+        }) + "\n"
+
+    async for line_no, row, error in rows:
+        totals["rows"] += 1
+        if error:
+            parse_errors.append({"line": line_no, "error": error})
+        else:
+            batch.append((line_no, row))
+        if len(batch) + len(parse_errors) >= batch_size:
+            yield await flush()
+    if batch or parse_errors:
+        yield await flush()
+
+    yield json.dumps({"done": True, **totals, "seconds": round(time.monotonic() - started, 3)}) + "\n"
@@ -1,16 +1,22 @@
 # services/sku_service.py
 
-from utils.mongo_utils import sku_collection, mongo_to_dict
+from utils.mongo_utils import sku_collection
+from services.sku_catalog_service import invalidate_sku_packing
+from utils.pagination import paginate
 
 # Service to save SKU data
 async def save_sku_service(data):
     sku_data = {"header": data.header, "body": data.body}
     result = await sku_collection.insert_one(sku_data)
+    invalidate_sku_packing([sku.get("sku_id") for sku in data.body.get("sku_list", [])])
     return {"message": "SKU data saved successfully", "sku_id": str(result.inserted_id)}
 
 # Service to get SKU by sku_id
 async def get_sku_service(sku_id: str):
-    sku = await sku_collection.find_one({"body.sku_list.sku_id": sku_id})
+    sku = await sku_collection.find_one(
+        {"body.sku_list.sku_id": sku_id},
+        {"body.sku_list.$": 1}
+    )
     
     if sku is None:
         raise Exception(f"SKU {sku_id} not found")
@@ -22,8 +28,6 @@ async def get_sku_service(sku_id: str):
     
     return {"sku_id": sku_id, "sku_data": sku_data}
 
-# Service to get all SKUs with pagination
-async def get_all_skus_service(skip: int, limit: int):
-    skus = await sku_collection.find().skip(skip).limit(limit).to_list(length=limit)
-    skus = mongo_to_dict(skus)
-    return {"skus": skus}
+# Service to get all SKUs with keyset pagination
+async def get_all_skus_service(cursor: str = None, limit: int = 10):
+    return await paginate(sku_collection, cursor=cursor, limit=limit)
@@ -1,14 +1,26 @@
 # services/station_service.py
 
-from utils.mongo_utils import serialize_dict, putaway_station  # Import utility functions and collections
+import os
+from collections import Counter
+from pymongo import ReturnDocument, UpdateOne
+from utils.mongo_utils import field_projection, putaway_station  # Import utility functions and collections
 from models.station_model import StationLoadUpdate
+from services.stream_service import stream_hub
+from utils.pagination import paginate
+
+STATION_FIELDS = ["station_id", "map_id", "queue_length", "location"]
+# Estimated dock time per task, used to project station queues during task generation
+STATION_SERVICE_TIME_BASE = float(os.getenv("STATION_SERVICE_TIME_BASE", 10.0))
+STATION_SERVICE_TIME_PER_UNIT = float(os.getenv("STATION_SERVICE_TIME_PER_UNIT", 2.0))
 
 async def update_station(data: StationLoadUpdate):
-    return await putaway_station.update_one(
+    result = await putaway_station.update_one(
         {"station_id": data.station_id, "map_id": data.map_id},
         {"$set": data.dict()},
         upsert=True
     )
+    stream_hub.publish(data.map_id, "stations", {"station_id": data.station_id, "queue_length": data.queue_length})
+    return result
 
 async def add_station(data: StationLoadUpdate):
     existing = await putaway_station.find_one({"station_id": data.station_id, "map_id": data.map_id})
@@ -17,6 +29,32 @@ async def add_station(data: StationLoadUpdate):
     await putaway_station.insert_one(data.dict())
     return True
 
-async def get_stations():
-    stations_cursor = putaway_station.find()
-    return serialize_dict(await stations_cursor.to_list(length=None))
+async def get_stations(cursor: str = None, limit: int = 100, fields: str = None):
+    return await paginate(putaway_station, projection=field_projection(STATION_FIELDS, fields), cursor=cursor, limit=limit)
+
+async def save_station_loads(map_id: str, tasks):
+    """Add the saved tasks to their stations' queue_length in one bulk write ($inc, so concurrent updates add up)."""
+    counts = Counter(task["station_id"] for task in tasks)
+    if not counts:
+        return
+    await putaway_station.bulk_write([
+        UpdateOne({"station_id": station_id, "map_id": map_id}, {"$inc": {"queue_length": count}})
+        for station_id, count in counts.items()
+    ], ordered=False)
+    if map_id not in stream_hub.subscribers:
+        return
+    docs = await putaway_station.find(
+        {"map_id": map_id, "station_id": {"$in": list(counts)}}, {"_id": 0, "station_id": 1, "queue_length": 1}
+    ).to_list(length=None)
+    stream_hub.publish_many(map_id, "stations", docs)
+
+async def adjust_station_queue(map_id: str, station_id: str, delta: int):
+    """Move one station's queue_length by delta, never below zero."""
+    station = await putaway_station.find_one_and_update(
+        {"station_id": station_id, "map_id": map_id, **({"queue_length": {"$gte": -delta}} if delta < 0 else {})},
+        {"$inc": {"queue_length": delta}},
+        projection={"_id": 0, "station_id": 1, "queue_length": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if station:
+        stream_hub.publish(map_id, "stations", station)
@@ -0,0 +1,119 @@
+# services/stream_service.py
+import asyncio
+import json
+import os
+
+STREAM_TICK_INTERVAL = float(os.getenv("STREAM_TICK_INTERVAL", 0.25))
+STREAM_QUEUE_SIZE = int(os.getenv("STREAM_QUEUE_SIZE", 64))
+
+# Delta kinds and the field naming the entity they belong to
+DELTA_KEYS = {"robots": "robot_id", "tasks": "task_id", "stations": "station_id"}
+
+
+class MapStreamHub:
+    """
+    Fan-out of per-map change deltas to streaming clients.
+
+    Writers call publish() with the fields that changed; changes to the same
+    entity within one tick are merged. Every tick each map with pending changes
+    is encoded once and the same message is handed to all of its subscribers,
+    so extra viewers only cost a queue put. A subscriber that falls
+    STREAM_QUEUE_SIZE messages behind is dropped and has to reconnect.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.pending = {}
+        self.ticks = 0
+        self._ticker = None
+
+    def publish(self, map_id: str, kind: str, delta: dict):
+        if map_id not in self.subscribers:
+            return
+        entities = self.pending.setdefault(map_id, {}).setdefault(kind, {})
+        key = delta[DELTA_KEYS[kind]]
+        entities.setdefault(key, {}).update(delta)
+
+    def publish_many(self, map_id: str, kind: str, deltas):
+        if map_id not in self.subscribers:
+            return
+        entities = self.pending.setdefault(map_id, {}).setdefault(kind, {})
+        key = DELTA_KEYS[kind]
+        for delta in deltas:
+            entities.setdefault(delta[key], {}).update(delta)
+
+    def subscribe(self, map_id: str):
+        queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+        self.subscribers.setdefault(map_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, map_id: str, queue):
+        queues = self.subscribers.get(map_id)
+        if queues is None:
+            return
+        queues.discard(queue)
+        if not queues:
+            del self.subscribers[map_id]
+            self.pending.pop(map_id, None)
+
+    def tick(self):
+        pending, self.pending = self.pending, {}
+        self.ticks += 1
+        for map_id, kinds in pending.items():
+            message = encode_event("delta", {
+                "map_id": map_id,
+                "tick": self.ticks,
+                **{kind: list(entities.values()) for kind, entities in kinds.items()}
+            })
+            for queue in list(self.subscribers.get(map_id, ())):
+                try:
+                    queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # Too far behind: drop its backlog and end its stream
+                    self.unsubscribe(map_id, queue)
+                    while not queue.empty():
+                        queue.get_nowait()
+                    queue.put_nowait(None)
+
+    async def _run(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            self.tick()
+
+    def start(self, interval: float = STREAM_TICK_INTERVAL):
+        if self._ticker is None:
+            self._ticker = asyncio.create_task(self._run(interval))
+
+    async def stop(self):
+        if self._ticker is not None:
+            self._ticker.cancel()
+            try:
+                await self._ticker
+            except asyncio.CancelledError:
+                pass
+            self._ticker = None
+
+
+async def map_event_stream(map_id: str, snapshot: dict, keepalive: float = 15.0):
+    """SSE body for one client: a snapshot event, then the map's coalesced deltas."""
+    queue = stream_hub.subscribe(map_id)
+    try:
+        yield encode_event("snapshot", {"map_id": map_id, **snapshot})
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if message is None:
+                break
+            yield message
+    finally:
+        stream_hub.unsubscribe(map_id, queue)
+
+
+def encode_event(event: str, data: dict):
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+stream_hub = MapStreamHub()
@@ -1,128 +1,470 @@
 # services/task_service.py
+import asyncio
+import os
 from fastapi import HTTPException
-import httpx
-import random
-from utils.mongo_utils import serialize_dict, putaway_tasks  # Import utility functions and MongoDB collections
+from fastapi.concurrency import run_in_threadpool
+from pymongo import ReturnDocument
+from pymongo.errors import BulkWriteError
+import uuid
+from services.assignment_service import ProximityAssigner, assign_wave
+from services.pathfinding_service import get_map_grid
+from services.shelf_service import release_shelf_space, reserve_shelf_space, settle_shelf_reservation
+from services.sku_catalog_service import get_sku_packing_batch
+from services.station_service import (
+    STATION_SERVICE_TIME_BASE, STATION_SERVICE_TIME_PER_UNIT, adjust_station_queue, save_station_loads
+)
+from services.stream_service import stream_hub
+from utils.metrics import PLACEMENT_FAILURES, SHELF_RESERVATION_CONFLICTS, TASKS_GENERATED
+from utils.pagination import paginate
+from utils.shelf_index import ShelfBinPacker
+from utils.station_scheduler import StationScheduler
+from utils.mongo_utils import (  # Import utility functions and MongoDB collections
+    field_projection, putaway_tasks, putaway_orders, robot_status, shelf_status, putaway_station
+)
 
-async def fetch_putaway_tasks(map_id: str):
+TASK_INSERT_BATCH_SIZE = int(os.getenv("TASK_INSERT_BATCH_SIZE", 1000))
+MAX_TASKS_PER_ROBOT = 3
+SHELF_RESERVATION_RETRIES = int(os.getenv("SHELF_RESERVATION_RETRIES", 3))
+TASK_FIELDS = [
+    "task_id", "putaway_order_code", "robot_id", "station_id", "map_id", "shelf_id", "level", "sku_id", "amount", "status"
+]
+
+async def fetch_putaway_tasks(map_id: str, cursor: str = None, limit: int = 100, fields: str = None):
     try:
-        tasks = await putaway_tasks.find({"map_id": map_id}).to_list(length=100)
-        return [serialize_dict(task) for task in tasks]
+        return await paginate(
+            putaway_tasks, {"map_id": map_id}, field_projection(TASK_FIELDS, fields), cursor=cursor, limit=limit
+        )
+    except HTTPException:
+        raise
     except Exception:
         raise HTTPException(status_code=500, detail="Error fetching putaway tasks")
 
+# Loaders for the generation pipeline, each one query against its collection
+async def load_latest_order():
+    order = await putaway_orders.find_one(sort=[("_id", -1)])
+    if not order:
+        raise HTTPException(status_code=404, detail="No putaway orders found")
+    return order.get("body", {}).get("orders", [{}])[0]
+
+async def load_idle_robots(map_id: str):
+    return await robot_status.find({"status": "idle", "map_id": map_id}).to_list(length=None)
+
+async def load_shelves(map_id: str):
+    return await shelf_status.find({"map_id": map_id}).to_list(length=None)
+
+async def load_stations(map_id: str):
+    return await putaway_station.find({"map_id": map_id}).to_list(length=None)
+
+def station_scheduler(stations):
+    return StationScheduler(stations, STATION_SERVICE_TIME_BASE, STATION_SERVICE_TIME_PER_UNIT)
+
+async def _no_map():
+    return None
+
+def new_task_id():
+    return f"TASK_{uuid.uuid4().hex[:10].upper()}"
+
+async def reserve_tasks(map_id: str, tasks, sku_packing):
+    """
+    Commit the shelf space of tasks planned on a snapshot of shelf_status.
+    Tasks whose level filled up in the meantime are re-packed on freshly
+    loaded shelves and tried again up to SHELF_RESERVATION_RETRIES times. A
+    task only moves if it still fits on a single level, so it keeps its
+    amount, robot and station and the robot caps and station projections
+    still hold. Returns (reserved tasks, space per task_id, tasks left
+    without space).
+    """
+    space = {task["task_id"]: task["amount"] * sku_packing[task["sku_id"]]["volume"] for task in tasks}
+    reserved, unplaced = [], []
+    attempt = tasks
+    for retry in range(SHELF_RESERVATION_RETRIES + 1):
+        conflicts = await reserve_shelf_space(map_id, attempt, space)
+        conflict_ids = {task["task_id"] for task in conflicts}
+        reserved += [task for task in attempt if task["task_id"] not in conflict_ids]
+        if not conflicts:
+            break
+        SHELF_RESERVATION_CONFLICTS.inc(len(conflicts))
+        if retry == SHELF_RESERVATION_RETRIES:
+            unplaced += conflicts
+            break
+        packer = ShelfBinPacker(await load_shelves(map_id))
+        packed = packer.pack([
+            (task["amount"], sku_packing[task["sku_id"]]["volume"], sku_packing[task["sku_id"]]["height"])
+            for task in conflicts
+        ])
+        attempt = []
+        for task, (placements, amount_remaining) in zip(conflicts, packed):
+            if amount_remaining > 0 or len(placements) != 1:
+                unplaced.append(task)
+                continue
+            shelf_pos, level_name, _ = placements[0]
+            moved = {**task, "task_id": new_task_id(), "shelf_id": packer.shelf(shelf_pos)["shelf_id"], "level": level_name}
+            space[moved["task_id"]] = space[task["task_id"]]
+            attempt.append(moved)
+    return reserved, space, unplaced
+
+def task_delta(task):
+    return {key: task[key] for key in ("task_id", "status", "robot_id", "station_id", "shelf_id")}
+
+async def settle_task_space(task, status: str):
+    """A completed task's reservation turns into stock on its level; a failed task gives the space back."""
+    if status == "completed":
+        await settle_shelf_reservation(task["map_id"], task)
+    elif status == "failed":
+        sku_packing = await get_sku_packing_batch([task["sku_id"]])
+        if sku_packing.get(task["sku_id"]):
+            space = {task["task_id"]: task["amount"] * sku_packing[task["sku_id"]]["volume"]}
+            await release_shelf_space(task["map_id"], [task], space)
+
+async def update_task_status(task_id: str, status: str):
+    task = await putaway_tasks.find_one_and_update(
+        {"task_id": task_id},
+        {"$set": {"status": status}},
+        projection={
+            "_id": 0, "task_id": 1, "status": 1, "robot_id": 1, "station_id": 1, "shelf_id": 1, "map_id": 1,
+            "level": 1, "sku_id": 1, "amount": 1
+        },
+        return_document=ReturnDocument.BEFORE
+    )
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    # Pending tasks are what generation counted into their station's queue_length
+    previous, task["status"] = task["status"], status
+    was_pending = previous == "pending"
+    if was_pending != (status == "pending") and task.get("station_id"):
+        await adjust_station_queue(task["map_id"], task["station_id"], -1 if was_pending else 1)
+    if previous not in ("completed", "failed") and task.get("level"):
+        await settle_task_space(task, status)
+    stream_hub.publish(task["map_id"], "tasks", task_delta(task))
+    return {"message": "Task status updated", "task": task}
+
+async def insert_tasks(tasks, batch_size: int = TASK_INSERT_BATCH_SIZE):
+    """
+    Persist tasks with unordered insert_many batches. Returns (inserted, failed):
+    inserted tasks carry their _id as a string, failed lists {task_id, error}.
+    """
+    inserted, failed = [], []
+    for i in range(0, len(tasks), batch_size):
+        batch = tasks[i:i + batch_size]
+        rejected = {}
+        try:
+            await putaway_tasks.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            rejected = {err["index"]: err.get("errmsg", "write error") for err in e.details.get("writeErrors", [])}
+        for index, task in enumerate(batch):
+            if index in rejected:
+                task.pop("_id", None)
+                failed.append({"task_id": task["task_id"], "error": rejected[index]})
+            else:
+                task["_id"] = str(task["_id"])
+                inserted.append(task)
+    return inserted, failed
+
+async def withdraw_tasks(map_id: str, tasks, space):
+    """Delete tasks that were saved and give back the shelf space they reserved."""
+    if tasks:
+        await putaway_tasks.delete_many({"task_id": {"$in": [task["task_id"] for task in tasks]}})
+        await release_shelf_space(map_id, tasks, space)
+
+async def release_failed_tasks(map_id: str, tasks, failed_tasks, space):
+    """Tasks that could not be saved give their reserved shelf space back."""
+    failed_ids = {failed["task_id"] for failed in failed_tasks}
+    await release_shelf_space(map_id, [task for task in tasks if task["task_id"] in failed_ids], space)
+
 async def generate_putaway_tasks(mode: str = "proximity"):
-    MAX_TASKS_PER_ROBOT = 3
     try:
-        async with httpx.AsyncClient() as client:
-            order_response = await client.get("http://localhost:8000/orders/putaway/latest")
-            order_response.raise_for_status()
-            order = order_response.json().get("body", {}).get("orders", [{}])[0]
-
-            putaway_order_code = order.get("order_details", {}).get("putaway_order_code")
-            map_id = order.get("order_details", {}).get("map_id")
-            sku_items = order.get("sku_items", [])
-
-            if not putaway_order_code or not map_id or not sku_items:
-                raise HTTPException(status_code=400, detail="Incomplete order data")
-
-            robots = (await client.get(f"http://localhost:8000/robots/idle?map_id={map_id}")).json().get("robots", [])
-            if not robots:
-                raise HTTPException(status_code=404, detail="No available robots")
-
-            # Sort robots based on selected mode
-            if mode == "proximity":
-                sorted_robots = sorted(robots, key=lambda r: r["location"]["x"])
-            elif mode == "energy":
-                sorted_robots = sorted(robots, key=lambda r: r.get("battery_level", 0), reverse=True)
-            elif mode == "load_balanced":
-                sorted_robots = sorted(robots, key=lambda r: r.get("filled_space", 0))  # ascending
-            else:
-                raise HTTPException(status_code=400, detail=f"Unknown AGV mode: {mode}")
-
-            robot_task_counts = {r["robot_id"]: 0 for r in sorted_robots}
-            robot_index = 0
-
-            shelves = (await client.get(f"http://localhost:8000/station/shelves?map_id={map_id}")).json()
-            if not shelves:
-                raise HTTPException(status_code=404, detail="No shelves found")
-
-            sku_dimensions = {}
-            for sku in sku_items:
-                sku_info = (await client.get(f"http://localhost:8000/get-sku/{sku['sku_id']}")).json()
-                primary = sku_info["sku_data"]["sku_packing"][0].get("primary")
-                if not primary:
-                    raise HTTPException(status_code=400, detail=f"Missing packing data for {sku['sku_id']}")
-                sku_dimensions[sku["sku_id"]] = {
-                    "volume": primary.get("sku_packing_volume", 0.0),
-                    "height": primary.get("sku_packing_height", 0.0)
-                }
+        order = await load_latest_order()
+
+        putaway_order_code = order.get("order_details", {}).get("putaway_order_code")
+        map_id = order.get("order_details", {}).get("map_id")
+        sku_items = order.get("sku_items", [])
+
+        if not putaway_order_code or not map_id or not sku_items:
+            raise HTTPException(status_code=400, detail="Incomplete order data")
+
+        robots, shelves, stations, sku_packing, map_grid = await asyncio.gather(
+            load_idle_robots(map_id),
+            load_shelves(map_id),
+            load_stations(map_id),
+            get_sku_packing_batch([sku["sku_id"] for sku in sku_items]),
+            get_map_grid(map_id) if mode == "proximity" else _no_map(),
+        )
+
+        if not robots:
+            raise HTTPException(status_code=404, detail="No available robots")
+
+        # Sort robots based on selected mode; proximity picks per task by travel distance
+        proximity = None
+        if mode == "proximity":
+            sorted_robots = robots
+            proximity = ProximityAssigner(robots, map_grid, MAX_TASKS_PER_ROBOT)
+        elif mode == "energy":
+            sorted_robots = sorted(robots, key=lambda r: r.get("battery_level", 0), reverse=True)
+        elif mode == "load_balanced":
+            sorted_robots = sorted(robots, key=lambda r: r.get("filled_space", 0))  # ascending
+        else:
+            raise HTTPException(status_code=400, detail=f"Unknown AGV mode: {mode}")
+
+        robot_task_counts = {r["robot_id"]: 0 for r in sorted_robots}
+        robot_index = 0
 
-            putaway_tasks_created = []
-
-            for sku in sku_items:
-                sku_id = sku["sku_id"]
-                amount_remaining = sku["amount"]
-                volume = sku_dimensions[sku_id]["volume"]
-                height = sku_dimensions[sku_id]["height"]
-
-                for shelf in sorted(shelves, key=lambda s: s["available_space"], reverse=True):
-                    if amount_remaining <= 0:
-                        break
-                    for level_name in ["third", "second", "ground"]:
-                        level = shelf["shelf_levels"].get(level_name)
-                        if not level or height > level.get("max_height", float('inf')):
-                            continue
-
-                        units_fit = int(level["available_space"] // volume)
-                        units_to_place = min(units_fit, amount_remaining)
-
-                        if units_to_place > 0:
-                            level["available_space"] -= units_to_place * volume
-                            shelf["available_space"] -= units_to_place * volume
-                            level.setdefault("sku_details", []).append({"sku_id": sku_id, "amount": units_to_place})
-
-                            stations = (await client.get(f"http://localhost:8000/station/putaway-stations?map_id={map_id}")).json()
-                            if not stations:
-                                raise HTTPException(status_code=404, detail="No stations found")
-
-                            station = sorted(stations, key=lambda s: s["queue_length"])[0]
-
-                            for _ in range(len(sorted_robots)):
-                                current_robot = sorted_robots[robot_index]
-                                if robot_task_counts[current_robot["robot_id"]] < MAX_TASKS_PER_ROBOT:
-                                    assigned_robot = current_robot
-                                    robot_task_counts[current_robot["robot_id"]] += 1
-                                    break
-                                robot_index = (robot_index + 1) % len(sorted_robots)
-                            else:
-                                raise HTTPException(status_code=500, detail="Not enough robot capacity")
-
-                            task = {
-                                "task_id": f"TASK_{random.randint(1000, 9999)}",
-                                "putaway_order_code": putaway_order_code,
-                                "robot_id": assigned_robot["robot_id"],
-                                "station_id": station["station_id"],
-                                "map_id": map_id,
-                                "shelf_id": shelf["shelf_id"],
-                                "level": level_name,
-                                "sku_id": sku_id,
-                                "amount": units_to_place,
-                                "status": "pending"
-                            }
-                            putaway_tasks_created.append(task)
-                            amount_remaining -= units_to_place
+        if not shelves:
+            raise HTTPException(status_code=404, detail="No shelves found")
+
+        if not stations:
+            raise HTTPException(status_code=404, detail="No stations found")
+        scheduler = station_scheduler(stations)
+
+        sku_dimensions = {}
+        for sku in sku_items:
+            if sku["sku_id"] not in sku_packing:
+                raise HTTPException(status_code=404, detail=f"SKU {sku['sku_id']} not found")
+            if not sku_packing[sku["sku_id"]]:
+                raise HTTPException(status_code=400, detail=f"Missing packing data for {sku['sku_id']}")
+            sku_dimensions[sku["sku_id"]] = sku_packing[sku["sku_id"]]
+
+        putaway_tasks_created = []
+        # All lines of the order are packed together, so one line cannot take the only level another needs
+        packer = ShelfBinPacker(shelves)
+        packed = packer.pack([
+            (sku["amount"], sku_dimensions[sku["sku_id"]]["volume"], sku_dimensions[sku["sku_id"]]["height"])
+            for sku in sku_items
+        ])
+
+        if proximity:
+            await run_in_threadpool(proximity.prepare, [
+                packer.shelf(shelf_pos)["shelf_id"] for placements, _ in packed for shelf_pos, _, _ in placements
+            ])
+
+        for sku, (placements, amount_remaining) in zip(sku_items, packed):
+            sku_id = sku["sku_id"]
+            for shelf_pos, level_name, units_to_place in placements:
+                shelf = packer.shelf(shelf_pos)
+                station = scheduler.assign(units_to_place)
+
+                if proximity:
+                    assigned_robot = proximity.assign(shelf["shelf_id"])
+                    if assigned_robot is None:
+                        raise HTTPException(status_code=500, detail="Not enough robot capacity")
+                else:
+                    for _ in range(len(sorted_robots)):
+                        current_robot = sorted_robots[robot_index]
+                        if robot_task_counts[current_robot["robot_id"]] < MAX_TASKS_PER_ROBOT:
+                            assigned_robot = current_robot
+                            robot_task_counts[current_robot["robot_id"]] += 1
                             break
-                if amount_remaining > 0:
-                    raise HTTPException(status_code=400, detail=f"Insufficient space for SKU {sku_id}")
+                        robot_index = (robot_index + 1) % len(sorted_robots)
+                    else:
+                        raise HTTPException(status_code=500, detail="Not enough robot capacity")
 
-        response_tasks = []
-        for task in putaway_tasks_created:
-            result = await putaway_tasks.insert_one(task)
-            task["_id"] = str(result.inserted_id)
-            response_tasks.append(task)
+                task = {
+                    "task_id": new_task_id(),
+                    "putaway_order_code": putaway_order_code,
+                    "robot_id": assigned_robot["robot_id"],
+                    "station_id": station["station_id"],
+                    "map_id": map_id,
+                    "shelf_id": shelf["shelf_id"],
+                    "level": level_name,
+                    "sku_id": sku_id,
+                    "amount": units_to_place,
+                    "status": "pending"
+                }
+                putaway_tasks_created.append(task)
+            if amount_remaining > 0:
+                PLACEMENT_FAILURES.inc()
+                raise HTTPException(status_code=400, detail=f"Insufficient space for SKU {sku_id}")
+
+        # The packing above ran on a snapshot; another generation may have taken the space since
+        reserved, space, unplaced = await reserve_tasks(map_id, putaway_tasks_created, sku_dimensions)
+        if unplaced:
+            await release_shelf_space(map_id, reserved, space)
+            PLACEMENT_FAILURES.inc()
+            raise HTTPException(status_code=409, detail=f"Shelf space for SKU {unplaced[0]['sku_id']} was taken concurrently")
+
+        try:
+            response_tasks, failed_tasks = await insert_tasks(reserved)
+            await release_failed_tasks(map_id, reserved, failed_tasks, space)
+            if failed_tasks and not response_tasks:
+                raise HTTPException(status_code=500, detail=f"Failed to save tasks: {failed_tasks[0]['error']}")
+            await save_station_loads(map_id, response_tasks)
+        except Exception:
+            # Nothing of a failed generation keeps shelf space
+            await withdraw_tasks(map_id, reserved, space)
+            raise
 
-        return {"message": "Putaway tasks created", "tasks": response_tasks}
+        TASKS_GENERATED.labels(mode).inc(len(response_tasks))
+        stream_hub.publish_many(map_id, "tasks", [task_delta(task) for task in response_tasks])
 
+        response = {"message": "Putaway tasks created", "tasks": response_tasks}
+        if failed_tasks:
+            response["failed_tasks"] = failed_tasks
+        return response
+
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate task: {str(e)}")
+
+
+async def load_pending_orders(map_id: str, max_orders: int = None):
+    """Orders for map_id not yet turned into tasks, oldest first, as (document _id, order) pairs."""
+    cursor = putaway_orders.find(
+        {"body.orders.order_details.map_id": map_id, "status": {"$in": [None, "pending"]}}
+    ).sort("_id", 1)
+    pending = []
+    async for doc in cursor:
+        done = set(doc.get("tasked_orders", []))
+        for order in doc.get("body", {}).get("orders", []):
+            details = order.get("order_details", {})
+            if details.get("map_id") == map_id and details.get("putaway_order_code") not in done:
+                pending.append((doc["_id"], order))
+        if max_orders and len(pending) >= max_orders:
+            return pending[:max_orders]
+    return pending
+
+async def load_pending_load(map_id: str, robot_ids):
+    rows = await putaway_tasks.aggregate([
+        {"$match": {"map_id": map_id, "status": "pending", "robot_id": {"$in": robot_ids}}},
+        {"$group": {"_id": "$robot_id", "count": {"$sum": 1}}}
+    ]).to_list(length=None)
+    return {row["_id"]: row["count"] for row in rows}
+
+async def _mark_orders_tasked(pending, tasked_codes, wave_id: str):
+    """Set status on documents whose orders all got tasks; record the tasked codes on the rest."""
+    by_doc = {}
+    for doc_id, order in pending:
+        by_doc.setdefault(doc_id, []).append(order["order_details"]["putaway_order_code"])
+    complete = [doc_id for doc_id, codes in by_doc.items() if all(code in tasked_codes for code in codes)]
+    if complete:
+        await putaway_orders.update_many(
+            {"_id": {"$in": complete}}, {"$set": {"status": "tasks_generated", "wave_id": wave_id}}
+        )
+    for doc_id, codes in by_doc.items():
+        done = [code for code in codes if code in tasked_codes]
+        if doc_id not in complete and done:
+            await putaway_orders.update_one({"_id": doc_id}, {"$addToSet": {"tasked_orders": {"$each": done}}})
+
+async def generate_wave_tasks(map_id: str, max_orders: int = None):
+    """
+    Turn every pending order of a map into tasks at once. Orders are
+    bin-packed one at a time, oldest first, then robots are matched to the
+    tasks by minimum total cost (distance, battery, current load) instead of
+    round-robin. An order is tasked whole or not at all: orders that do not
+    fit on the shelves, whose tasks find no robot slot, or whose tasks could
+    not all be saved give back what they took and stay pending for the next
+    wave.
+    """
+    pending = await load_pending_orders(map_id, max_orders)
+    if not pending:
+        raise HTTPException(status_code=404, detail="No pending putaway orders")
+    orders = [order for _, order in pending]
+    sku_ids = [sku["sku_id"] for order in orders for sku in order.get("sku_items", [])]
+
+    robots, shelves, stations, sku_packing, map_grid = await asyncio.gather(
+        load_idle_robots(map_id),
+        load_shelves(map_id),
+        load_stations(map_id),
+        get_sku_packing_batch(sku_ids),
+        get_map_grid(map_id),
+    )
+    if not robots:
+        raise HTTPException(status_code=404, detail="No available robots")
+    if not shelves:
+        raise HTTPException(status_code=404, detail="No shelves found")
+    if not stations:
+        raise HTTPException(status_code=404, detail="No stations found")
+    pending_load = await load_pending_load(map_id, [r["robot_id"] for r in robots])
+
+    deferred = {}
+    tasks = []
+    packer = ShelfBinPacker(shelves)
+    for order in orders:
+        code = order["order_details"]["putaway_order_code"]
+        skus = order.get("sku_items", [])
+        missing = next((sku["sku_id"] for sku in skus if not sku_packing.get(sku["sku_id"])), None)
+        if missing:
+            deferred[code] = f"Missing packing data for {missing}"
+            continue
+        packed = packer.pack([
+            (sku["amount"], sku_packing[sku["sku_id"]]["volume"], sku_packing[sku["sku_id"]]["height"]) for sku in skus
+        ])
+        short = next((sku for sku, (_, amount_remaining) in zip(skus, packed) if amount_remaining > 0), None)
+        if short:
+            # The order waits whole, so the lines that did fit free their space for the orders after it
+            for sku, (placements, _) in zip(skus, packed):
+                packer.release(placements, sku_packing[sku["sku_id"]]["volume"])
+            PLACEMENT_FAILURES.inc()
+            deferred[code] = f"Insufficient space for SKU {short['sku_id']}"
+            continue
+        for sku, (placements, _) in zip(skus, packed):
+            for shelf_pos, level_name, units in placements:
+                tasks.append({
+                    "task_id": new_task_id(),
+                    "putaway_order_code": code,
+                    "robot_id": None,
+                    "station_id": None,
+                    "map_id": map_id,
+                    "shelf_id": packer.shelf(shelf_pos)["shelf_id"],
+                    "level": level_name,
+                    "sku_id": sku["sku_id"],
+                    "amount": units,
+                    "status": "pending"
+                })
+
+    assigned, method = await run_in_threadpool(
+        assign_wave, robots, [task["shelf_id"] for task in tasks], map_grid, pending_load, MAX_TASKS_PER_ROBOT
+    )
+    for task, robot in zip(tasks, assigned):
+        if robot is None:
+            deferred.setdefault(task["putaway_order_code"], "Not enough robot capacity")
+        else:
+            task["robot_id"] = robot["robot_id"]
+    tasks = [task for task in tasks if task["putaway_order_code"] not in deferred]
+
+    reserved, space, unplaced = await reserve_tasks(map_id, tasks, sku_packing)
+    try:
+        for task in unplaced:
+            PLACEMENT_FAILURES.inc()
+            deferred.setdefault(
+                task["putaway_order_code"], f"Shelf space for SKU {task['sku_id']} was taken concurrently"
+            )
+        await release_shelf_space(map_id, [task for task in reserved if task["putaway_order_code"] in deferred], space)
+        tasks = [task for task in reserved if task["putaway_order_code"] not in deferred]
+        # Stations only for the tasks that stay in the wave, so deferred orders do not count against a queue
+        scheduler = station_scheduler(stations)
+        for task in tasks:
+            task["station_id"] = scheduler.assign(task["amount"])["station_id"]
+
+        response_tasks, failed_tasks = await insert_tasks(tasks)
+        await release_failed_tasks(map_id, tasks, failed_tasks, space)
+        if failed_tasks and not response_tasks:
+            raise HTTPException(status_code=500, detail=f"Failed to save tasks: {failed_tasks[0]['error']}")
+        # An order with an unsaved task takes back the tasks that were saved, so the next wave redoes it whole
+        codes = {task["task_id"]: task["putaway_order_code"] for task in tasks}
+        for failed in failed_tasks:
+            deferred.setdefault(codes[failed["task_id"]], f"Failed to save tasks: {failed['error']}")
+        await withdraw_tasks(map_id, [task for task in response_tasks if task["putaway_order_code"] in deferred], space)
+        response_tasks = [task for task in response_tasks if task["putaway_order_code"] not in deferred]
+        await save_station_loads(map_id, response_tasks)
+    except Exception:
+        # Nothing of a failed wave keeps shelf space
+        await withdraw_tasks(map_id, reserved, space)
+        raise
+    wave_id = f"WAVE_{uuid.uuid4().hex[:10].upper()}"
+    tasked_codes = {task["putaway_order_code"] for task in response_tasks}
+    await _mark_orders_tasked(pending, tasked_codes, wave_id)
+
+    TASKS_GENERATED.labels("wave").inc(len(response_tasks))
+    stream_hub.publish_many(map_id, "tasks", [task_delta(task) for task in response_tasks])
+
+    response = {
+        "message": "Wave tasks created",
+        "wave_id": wave_id,
+        "assignment": method,
+        "orders": len(tasked_codes),
+        "tasks": response_tasks,
+        "deferred_orders": [{"putaway_order_code": code, "reason": reason} for code, reason in deferred.items()]
+    }
+    if failed_tasks:
+        response["failed_tasks"] = failed_tasks
+    return response
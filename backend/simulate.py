@@ -0,0 +1,34 @@
+# simulate.py
+# Run a headless putaway shift against the configured MongoDB and print the summary:
+#   python simulate.py <map_id> [--hours 9] [--robot-speed 1.0]
+import argparse
+import asyncio
+import json
+from dotenv import load_dotenv
+
+load_dotenv()
+
+from services.simulation_service import run_simulation_service  # noqa: E402  (needs MONGO_URI loaded)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a discrete-event putaway simulation for one map.")
+    parser.add_argument("map_id")
+    parser.add_argument("--hours", type=float, default=None, help="shift length, defaults to working_hours")
+    parser.add_argument("--robot-speed", type=float, default=1.0, help="cells per second")
+    parser.add_argument("--service-time-base", type=float, default=10.0, help="seconds per station visit")
+    parser.add_argument("--service-time-per-unit", type=float, default=2.0, help="extra seconds per unit")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run_simulation_service(
+        args.map_id,
+        hours=args.hours,
+        robot_speed=args.robot_speed,
+        service_time_base=args.service_time_base,
+        service_time_per_unit=args.service_time_per_unit
+    ))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# tests/benchmarks/conftest.py
+# Benchmarks for the service hot paths against an in-memory Motor stand-in (mongomock-motor).
+# Run from backend/:
+#   pip install -r tests/benchmarks/requirements.txt
+#   python -m pytest tests/benchmarks
+# Each run is saved as JSON under .benchmarks/; compare a run against the previous one with
+#   python -m pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pymongo
+import pytest
+from mongomock_motor import AsyncMongoMockClient
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+
+import utils.mongo_utils as mongo_utils  # noqa: E402
+
+# Same database / collection names as utils/mongo_utils; swapped in before any service
+# module imports them, so the services run unchanged against memory.
+COLLECTIONS = {
+    "shelf_status": ("station_db", "shelf_status"),
+    "putaway_station": ("station_db", "putaway_station"),
+    "putaway_tasks": ("task_db", "putaway_tasks"),
+    "robot_status": ("robot_db", "robot_status"),
+    "putaway_orders": ("order_db", "putaway_order_tracking"),
+    "customer_orders": ("order_db", "customer_orders"),
+    "storage_collection": ("inventory_db", "storage"),
+    "agv_goods_collection": ("inventory_db", "agv_area_goods"),
+    "shelf_status_collection": ("inventory_db", "shelf_status"),
+    "sku_collection": ("sim", "sku"),
+    "maps_collection": ("map", "map"),
+}
+
+memory_client = AsyncMongoMockClient()
+mongo_utils.client = memory_client
+for attr, (db_name, collection_name) in COLLECTIONS.items():
+    setattr(mongo_utils, attr, memory_client[db_name][collection_name])
+
+
+async def _bulk_write(self, requests, ordered=True, **kwargs):
+    """mongomock's bulk_write does not accept current pymongo request objects; apply them one by one."""
+    result = SimpleNamespace(inserted_count=0, matched_count=0, modified_count=0, upserted_count=0, deleted_count=0)
+    for request in requests:
+        if isinstance(request, pymongo.InsertOne):
+            await self.insert_one(request._doc)
+            result.inserted_count += 1
+        elif isinstance(request, (pymongo.UpdateOne, pymongo.UpdateMany, pymongo.ReplaceOne)):
+            if isinstance(request, pymongo.UpdateOne):
+                outcome = await self.update_one(request._filter, request._doc, upsert=bool(request._upsert))
+            elif isinstance(request, pymongo.UpdateMany):
+                outcome = await self.update_many(request._filter, request._doc, upsert=bool(request._upsert))
+            else:
+                outcome = await self.replace_one(request._filter, request._doc, upsert=bool(request._upsert))
+            result.matched_count += outcome.matched_count
+            result.modified_count += outcome.modified_count
+            result.upserted_count += outcome.upserted_id is not None
+        elif isinstance(request, pymongo.DeleteOne):
+            result.deleted_count += (await self.delete_one(request._filter)).deleted_count
+        elif isinstance(request, pymongo.DeleteMany):
+            result.deleted_count += (await self.delete_many(request._filter)).deleted_count
+    return result
+
+
+type(mongo_utils.robot_status).bulk_write = _bulk_write
+
+from services.pathfinding_service import invalidate_map_grid  # noqa: E402
+from services.robot_service import fleet_store  # noqa: E402
+from services.sku_catalog_service import invalidate_sku_packing  # noqa: E402
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a loop kept for the whole test (Motor stand-ins bind to it)."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.close()
+
+
+@pytest.fixture(autouse=True)
+def empty_database(run):
+    yield
+    for db_name in {db_name for db_name, _ in COLLECTIONS.values()}:
+        run(memory_client.drop_database(db_name))
+    invalidate_sku_packing()
+    invalidate_map_grid()
+    fleet_store.fleets.clear()
@@ -0,0 +1,124 @@
+# tests/benchmarks/data.py
+# Document builders for the benchmarks, in the shapes the services store and read.
+import random
+
+LEVEL_SPACE = 13728.0
+MAP_COLS = 52
+
+
+def sku_item(sku_id: str, volume: float = 100.0, height: float = 10.0):
+    """A SKUItem payload that passes models.inventory_models validation."""
+    return {
+        "owner_code": "owner1",
+        "sku_id": sku_id,
+        "sku_code": sku_id.lower(),
+        "sku_name": f"Item {sku_id}",
+        "sku_price": 9.5,
+        "unit": "pcs",
+        "remark": None,
+        "dimensions": {"sku_length": 5.0, "sku_width": 2.0, "sku_height": height, "sku_volume": volume},
+        "weight": {"sku_net_weight": 0.5, "sku_gross_weight": 0.6},
+        "stock_limits": {"sku_min_count": 0, "sku_max_count": 1000},
+        "sku_shelf_life": 365,
+        "sku_specification": None,
+        "sku_status": 1,
+        "sku_abc": "A",
+        "is_sequence_sku": 0,
+        "sku_production_location": None,
+        "sku_brand": None,
+        "sku_attributes": {"sku_size": "M", "sku_color": None, "sku_style": None},
+        "sku_pic_url": None,
+        "is_bar_code_full_update": 0,
+        "sku_bar_code_list": [{"sku_bar_code": f"BC{sku_id}", "input_date": 1700000000000}],
+        "sku_packing": [{
+            "sku_packing_spec": "1x1",
+            "primary": {
+                "sku_packing_code": f"P{sku_id}",
+                "sku_packing_length": 5.0,
+                "sku_packing_width": 2.0,
+                "sku_packing_height": height,
+                "sku_packing_volume": volume,
+                "sku_packing_weight": 0.6,
+                "sku_packing_amount": 1
+            },
+            "secondary": None,
+            "tertiary": None
+        }]
+    }
+
+
+def sku_catalog_doc(sku_ids):
+    """A /save-sku/ document (header + body.sku_list)."""
+    return {"header": {}, "body": {"sku_amount": len(sku_ids), "sku_list": [sku_item(s) for s in sku_ids]}}
+
+
+def warehouse_map(shelves: int, robots: int, stations: int):
+    """
+    Shelf blocks two rows deep with an aisle row between them, robots and
+    stations along the top rows. Component order gives the S1../R1../ST1.. ids.
+    """
+    per_row = MAP_COLS - 2
+    shelf_rows = -(-shelves // per_row)
+    rows = 3 + shelf_rows + shelf_rows // 2 + 1
+    components = []
+    for i in range(stations):
+        components.append({"id": f"station-0-{i}", "type": "Station", "row": 0, "col": i % MAP_COLS})
+    for i in range(robots):
+        row, col = 1 + (i // MAP_COLS) % 2, i % MAP_COLS
+        components.append({"id": f"robot-{row}-{col}", "type": "Robot", "row": row, "col": col})
+    placed, row = 0, 3
+    for block_row in range(shelf_rows):
+        for col in range(1, min(per_row, shelves - placed) + 1):
+            components.append({"id": f"shelf-{row}-{col}", "type": "Shelf", "row": row, "col": col})
+        placed += per_row
+        row += 2 if block_row % 2 else 1
+    return {"name": f"bench-{shelves}", "rows": rows, "cols": MAP_COLS, "components": components}
+
+
+def shelf_docs(map_id: str, shelves: int):
+    levels = ("ground", "second", "third")
+    return [{
+        "shelf_id": f"S{i + 1}",
+        "map_id": map_id,
+        "shelf_capacity": LEVEL_SPACE * len(levels),
+        "available_space": LEVEL_SPACE * len(levels),
+        "shelf_levels": {level: {"available_space": LEVEL_SPACE, "sku_details": []} for level in levels}
+    } for i in range(shelves)]
+
+
+def robot_docs(map_doc, map_id: str):
+    cells = [(c["row"], c["col"]) for c in map_doc["components"] if c["type"] == "Robot"]
+    return [{
+        "robot_id": f"R{i + 1}",
+        "status": "idle",
+        "location": {"x": row, "y": col},
+        "map_id": map_id,
+        "battery_level": 100
+    } for i, (row, col) in enumerate(cells)]
+
+
+def station_docs(map_doc, map_id: str):
+    cells = [(c["row"], c["col"]) for c in map_doc["components"] if c["type"] == "Station"]
+    return [{
+        "station_id": f"ST{i + 1}",
+        "map_id": map_id,
+        "queue_length": 0,
+        "location": {"x": row, "y": col}
+    } for i, (row, col) in enumerate(cells)]
+
+
+def putaway_order(map_id: str, sku_ids, amount: int = 20, code: str = "BENCH001"):
+    return {"header": {}, "body": {"orders": [{
+        "order_details": {"putaway_order_code": code, "map_id": map_id},
+        "sku_items": [{"sku_id": sku_id, "amount": amount} for sku_id in sku_ids]
+    }]}}
+
+
+def heartbeats(map_id: str, robots: int, count: int, seed: int = 0):
+    rng = random.Random(seed)
+    return [{
+        "robot_id": f"R{rng.randint(1, robots)}",
+        "status": rng.choice(("idle", "busy")),
+        "location": {"x": rng.randint(0, 99), "y": rng.randint(0, 99)},
+        "map_id": map_id
+    } for _ in range(count)]
@@ -0,0 +1,135 @@
+# tests/benchmarks/test_algorithms.py
+# Correctness checks for the pure algorithms the benchmarks time; small, deterministic inputs.
+import itertools
+
+import numpy as np
+import pytest
+from data import warehouse_map
+from utils.assignment import hungarian
+from utils.map_codec import decode_map, encode_map
+from utils.multi_agent import plan_prioritized
+from utils.pathfinding import OccupancyGrid, distance_matrix, find_path
+from utils.shelf_index import ShelfBinPacker
+
+
+@pytest.mark.parametrize("rows,cols", [(1, 1), (3, 3), (4, 6), (6, 6)])
+def test_hungarian_matches_brute_force(rows, cols):
+    rng = np.random.default_rng(rows * 10 + cols)
+    for _ in range(20):
+        cost = rng.integers(0, 50, size=(rows, cols)).astype(float)
+        assignment = hungarian(cost)
+        best = min(
+            sum(cost[r, c] for r, c in enumerate(columns))
+            for columns in itertools.permutations(range(cols), rows)
+        )
+        assert len(set(assignment.tolist())) == rows
+        assert cost[np.arange(rows), assignment].sum() == best
+
+
+def level_shelves(*spaces):
+    return [{"shelf_id": f"S{i + 1}", "available_space": space, "shelf_levels": {"ground": {"available_space": space}}}
+            for i, space in enumerate(spaces)]
+
+
+def test_packer_leaves_a_line_that_does_not_fit_untouched():
+    shelves = level_shelves(60, 60, 30)
+    packer = ShelfBinPacker(shelves)
+
+    assert packer.pack([(3, 50, 10)]) == [([], 3)]
+    assert [shelf["shelf_levels"]["ground"]["available_space"] for shelf in shelves] == [60, 60, 30]
+    # The space it did not take is still there for the next line
+    placements, left = packer.pack([(3, 30, 10)])[0]
+    assert left == 0 and sum(units for _, _, units in placements) == 3
+
+
+def test_packer_splits_a_line_over_levels():
+    shelves = level_shelves(100, 100)
+    placements, left = ShelfBinPacker(shelves).pack([(4, 40, 10)])[0]
+
+    assert left == 0
+    assert sorted(units for _, _, units in placements) == [2, 2]
+    assert all(shelf["shelf_levels"]["ground"]["available_space"] >= 0 for shelf in shelves)
+
+
+def components_by_type(map_doc):
+    grouped = {}
+    for c in map_doc["components"]:
+        grouped.setdefault(c["type"], []).append((c["id"], c["row"], c["col"]))
+    return grouped
+
+
+def test_map_codec_round_trip():
+    map_doc = warehouse_map(40, robots=6, stations=3)
+    # Out of row-major order and with a non-default id, so the permutation and id tables are exercised
+    map_doc["components"].append({"id": "wall", "type": "Obstacle", "row": 2, "col": 9})
+    map_doc["components"].append({"id": "obstacle-2-3", "type": "Obstacle", "row": 2, "col": 3})
+
+    decoded = decode_map(encode_map(map_doc))
+
+    assert (decoded["name"], decoded["rows"], decoded["cols"]) == (map_doc["name"], map_doc["rows"], map_doc["cols"])
+    assert components_by_type(decoded) == components_by_type(map_doc)
+
+
+def test_find_path_goes_around_a_wall():
+    grid = OccupancyGrid(5, 5, blocked=[(0, 2), (1, 2), (2, 2), (3, 2)])
+    path = find_path(grid, (0, 0), (0, 4))
+
+    assert path[0] == (0, 0) and path[-1] == (0, 4)
+    assert len(path) - 1 == 12
+    assert all(grid.is_free(*cell) for cell in path)
+    assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 for a, b in zip(path, path[1:]))
+
+
+def test_find_path_unreachable():
+    grid = OccupancyGrid(3, 3, blocked=[(0, 1), (1, 1), (2, 1)])
+
+    assert find_path(grid, (0, 0), (0, 2)) == []
+
+
+def test_distance_matrix_matches_find_path():
+    rng = np.random.default_rng(7)
+    grid = OccupancyGrid(12, 15, blocked=[tuple(cell) for cell in rng.integers(0, [12, 15], size=(50, 2))])
+    cells = [tuple(cell) for cell in rng.integers(-1, [13, 16], size=(12, 2))]
+    sources, targets = cells[:5], cells[5:] + [cells[5]]
+
+    distances = distance_matrix(grid, sources, targets, batch_size=2)
+
+    for i, source in enumerate(sources):
+        for j, target in enumerate(targets):
+            path = find_path(grid, source, target) if grid.in_bounds(*source) and grid.in_bounds(*target) else []
+            assert distances[i, j] == (len(path) - 1 if path else -1)
+
+
+def test_plan_prioritized_has_no_conflicts():
+    # Corners to the far side around a central pillar, so every route crosses the others.
+    # Goals avoid the other starts: an agent that has not planned yet stays parked on its start.
+    grid = OccupancyGrid(5, 5, blocked=[(2, 2)])
+    agents = [
+        ("A", (0, 0), [(4, 3)]),
+        ("B", (4, 4), [(0, 1)]),
+        ("C", (0, 4), [(3, 0)]),
+        ("D", (4, 0), [(2, 4), (1, 4)]),
+    ]
+
+    paths, unplanned = plan_prioritized(grid, agents)
+
+    assert not unplanned
+    for agent_id, start, waypoints in agents:
+        path = paths[agent_id]
+        assert path[0] == start and path[-1] == waypoints[-1]
+        assert all(abs(a[0] - b[0]) + abs(a[1] - b[1]) <= 1 for a, b in zip(path, path[1:]))
+    horizon = max(len(path) for path in paths.values())
+    at = {agent_id: path + [path[-1]] * (horizon - len(path)) for agent_id, path in paths.items()}
+    for t in range(horizon):
+        cells = [at[agent_id][t] for agent_id in at]
+        assert len(set(cells)) == len(cells), f"vertex conflict at t={t}"
+        if t:
+            for a, b in itertools.combinations(at, 2):
+                assert not (at[a][t] == at[b][t - 1] and at[b][t] == at[a][t - 1]), f"{a} and {b} swap at t={t}"
+
+
+def test_plan_prioritized_rejects_cells_off_the_grid():
+    grid = OccupancyGrid(3, 3)
+
+    with pytest.raises(ValueError):
+        plan_prioritized(grid, [("A", (-1, 0), [(2, 2)])])
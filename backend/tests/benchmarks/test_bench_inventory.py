@@ -0,0 +1,33 @@
+# tests/benchmarks/test_bench_inventory.py
+from itertools import count
+
+import pytest
+from data import sku_item
+from models.inventory_models import SKUSyncRequest
+from services.inventory_service import handle_sku_creation
+from utils import mongo_utils
+
+
+@pytest.mark.parametrize("batch_size", [10, 100, 1000])
+def test_handle_sku_creation(benchmark, run, batch_size):
+    batches = count()
+
+    def fresh_batch():
+        # Every round starts from an empty catalog with new sku_ids, each with a reserved shelf to fill
+        n = next(batches)
+        run(mongo_utils.sku_collection.delete_many({}))
+        run(mongo_utils.shelf_status_collection.delete_many({}))
+        sku_ids = [f"B{n}-SKU{i}" for i in range(batch_size)]
+        run(mongo_utils.shelf_status_collection.insert_many(
+            [{"sku_id": sku_id, "sku_quantity": 0, "available_space": 50000.0} for sku_id in sku_ids]
+        ))
+        request = SKUSyncRequest(
+            header={}, body={"sku_amount": batch_size, "sku_list": [sku_item(sku_id) for sku_id in sku_ids]}
+        )
+        return (request,), {}
+
+    benchmark.extra_info["skus_per_call"] = batch_size
+    result = benchmark.pedantic(lambda request: run(handle_sku_creation(request)), setup=fresh_batch, rounds=5)
+
+    assert len(result["inserted_ids"]) == batch_size
+    assert result["shelves_updated"] == batch_size
@@ -0,0 +1,104 @@
+# tests/benchmarks/test_bench_maps.py
+import numpy as np
+import pytest
+from data import robot_docs, warehouse_map
+from models.map_model import MapRequest, PathBatchRequest
+from services.map_service import get_map_response_service, save_map_service
+from services.pathfinding_service import plan_paths_service
+from services.route_service import plan_routes_service
+from utils import mongo_utils
+from utils.map_codec import MAP_MEDIA_TYPE
+from utils.multi_agent import plan_prioritized
+from utils.pathfinding import OccupancyGrid, distance_matrix
+
+
+@pytest.mark.parametrize("shelves", [500, 5000])
+@pytest.mark.parametrize("accept", ["application/json", MAP_MEDIA_TYPE])
+def test_map_fetch(benchmark, run, accept, shelves):
+    saved = run(save_map_service(MapRequest(**warehouse_map(shelves, robots=50, stations=8))))
+
+    response = benchmark(lambda: run(get_map_response_service(saved["inserted_id"], accept)))
+
+    # Response size is the number to watch here; it lands in the JSON report next to the timings
+    benchmark.extra_info.update({"shelves": shelves, "bytes": len(response.body)})
+    assert response.status_code == 200
+
+
+def test_map_revalidation(benchmark, run):
+    saved = run(save_map_service(MapRequest(**warehouse_map(5000, robots=50, stations=8))))
+    etag = run(get_map_response_service(saved["inserted_id"], MAP_MEDIA_TYPE)).headers["etag"]
+
+    response = benchmark(lambda: run(get_map_response_service(saved["inserted_id"], MAP_MEDIA_TYPE, etag)))
+
+    assert response.status_code == 304
+
+
+def test_plan_paths(run):
+    saved = run(save_map_service(MapRequest(**warehouse_map(100, robots=4, stations=2))))
+    start, goal, outside = {"row": 0, "col": 0}, {"row": 4, "col": 0}, {"row": 999, "col": 0}
+    request = PathBatchRequest(queries=[
+        {"start": start, "goal": goal}, {"start": start, "goal": goal}, {"start": start, "goal": outside}
+    ])
+
+    result = run(plan_paths_service(saved["inserted_id"], request.queries))
+
+    first, repeated, unreachable = result["paths"]
+    assert first["length"] == 4 and first["path"][0] == start and first["path"][-1] == goal
+    assert repeated == first
+    assert unreachable["length"] is None and unreachable["path"] == []
+
+
+@pytest.mark.parametrize("size,shelves", [(300, 64), (500, 8)])
+def test_distance_matrix(benchmark, size, shelves):
+    # Aisle layout: shelf rows with a cross aisle every 20 columns; searches run from shelves to robots
+    grid = OccupancyGrid(size, size, [(r, c) for r in range(2, size - 2, 3) for c in range(1, size - 1) if c % 20])
+    rng = np.random.default_rng(0)
+    free = [(r, c) for r in range(size) for c in range(size) if grid.is_free(r, c)]
+    picks = rng.choice(len(free), shelves + 50, replace=False)
+    sources, targets = [free[i] for i in picks[:shelves]], [free[i] for i in picks[shelves:]]
+    benchmark.extra_info.update({"cells": size * size, "sources": shelves})
+
+    distances = benchmark(distance_matrix, grid, sources, targets)
+
+    assert (distances >= 0).all()
+
+
+def test_plan_routes_skips_robots_off_the_grid(run):
+    map_doc = warehouse_map(100, robots=2, stations=2)
+    map_id = run(save_map_service(MapRequest(**map_doc)))["inserted_id"]
+    robots = robot_docs(map_doc, map_id) + [
+        {"robot_id": robot_id, "location": {"x": x, "y": 0}, "map_id": map_id} for robot_id, x in (("R8", -1), ("R9", 999))
+    ]
+    run(mongo_utils.robot_status.insert_many(robots))
+    run(mongo_utils.putaway_tasks.insert_many([
+        {"task_id": f"T{robot_id}", "map_id": map_id, "status": "pending", "robot_id": robot_id,
+         "shelf_id": "S1", "station_id": "ST1"}
+        for robot_id in ("R1", "R8")
+    ]))
+
+    result = run(plan_routes_service(map_id))
+
+    assert result["skipped_robots"] == ["R8", "R9"]
+    assert result["skipped_tasks"] == ["TR8"]
+    assert [route["robot_id"] for route in result["routes"]] == ["R1", "R2"]
+    assert result["routes"][0]["task_ids"] == ["TR1"] and not result["unplanned"]
+
+
+@pytest.mark.parametrize("size,robots", [(60, 200), (100, 300)])
+def test_plan_prioritized(benchmark, size, robots):
+    # Random 5% obstacles; each robot drives to a shelf, a station on the top row and back to its start
+    rng = np.random.default_rng(1)
+    blocked = {(int(r), int(c)) for r, c in rng.integers(1, size, size=(size * size // 20, 2))}
+    grid = OccupancyGrid(size, size, blocked)
+    free = [(r, c) for r in range(1, size) for c in range(size) if (r, c) not in blocked]
+    picks = rng.choice(len(free), 2 * robots, replace=False)
+    stations = [(0, c) for c in range(0, size, 6)]
+    agents = [
+        (f"R{i}", free[picks[i]], [free[picks[robots + i]], stations[i % len(stations)], free[picks[i]]])
+        for i in range(robots)
+    ]
+    benchmark.extra_info.update({"cells": size * size, "robots": robots})
+
+    paths, unplanned = benchmark(plan_prioritized, grid, agents)
+
+    assert len(paths) == robots and len(unplanned) <= robots // 50
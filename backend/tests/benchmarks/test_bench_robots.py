@@ -0,0 +1,32 @@
+# tests/benchmarks/test_bench_robots.py
+import pytest
+from data import heartbeats
+from services.robot_service import fleet_store
+from utils import mongo_utils
+
+MAP_ID = "bench-map"
+
+
+@pytest.mark.parametrize("robots", [100, 1000])
+def test_heartbeat_ingestion(benchmark, run, robots):
+    # Fleet already loaded, as after the first heartbeat for the map
+    run(mongo_utils.robot_status.insert_many(heartbeats(MAP_ID, robots, robots)))
+    run(fleet_store.get(MAP_ID))
+    batch = heartbeats(MAP_ID, robots, 5000, seed=1)
+    benchmark.extra_info["heartbeats_per_call"] = len(batch)
+
+    assert benchmark(lambda: run(fleet_store.apply_heartbeats(batch))) == len(batch)
+
+
+def test_heartbeat_flush(benchmark, run):
+    robots = 1000
+    run(fleet_store.get(MAP_ID))
+
+    def dirty_fleet():
+        run(fleet_store.apply_heartbeats(heartbeats(MAP_ID, robots, robots * 2)))
+        return (), {}
+
+    benchmark.extra_info["robots"] = robots
+    written = benchmark.pedantic(lambda: run(fleet_store.flush()), setup=dirty_fleet, rounds=5)
+
+    assert 0 < written <= robots
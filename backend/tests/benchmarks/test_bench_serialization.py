@@ -0,0 +1,40 @@
+# tests/benchmarks/test_bench_serialization.py
+import orjson
+import pytest
+from bson import ObjectId
+from data import sku_catalog_doc
+from utils.mongo_utils import mongo_to_dict
+from utils.responses import MongoJSONResponse
+
+
+def large_documents(docs: int, skus_per_doc: int):
+    documents = []
+    for d in range(docs):
+        doc = sku_catalog_doc([f"D{d}-SKU{i}" for i in range(skus_per_doc)])
+        doc["_id"] = ObjectId()
+        for sku in doc["body"]["sku_list"]:
+            sku["_id"] = ObjectId()
+        documents.append(doc)
+    return documents
+
+
+@pytest.mark.parametrize("docs,skus_per_doc", [(10, 100), (10, 1000)])
+def test_mongo_to_dict(benchmark, docs, skus_per_doc):
+    documents = large_documents(docs, skus_per_doc)
+    benchmark.extra_info["skus"] = docs * skus_per_doc
+
+    result = benchmark(mongo_to_dict, documents)
+
+    assert isinstance(result[0]["body"]["sku_list"][0]["_id"], str)
+
+
+@pytest.mark.parametrize("docs,skus_per_doc", [(10, 100), (10, 1000)])
+def test_mongo_json_response(benchmark, docs, skus_per_doc):
+    # The same documents encoded the way the list endpoints now return them, for comparison
+    documents = large_documents(docs, skus_per_doc)
+    benchmark.extra_info["skus"] = docs * skus_per_doc
+
+    response = benchmark(MongoJSONResponse, documents)
+
+    benchmark.extra_info["bytes"] = len(response.body)
+    assert orjson.loads(response.body) == mongo_to_dict(documents)
@@ -0,0 +1,164 @@
+# tests/benchmarks/test_bench_tasks.py
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from data import putaway_order, robot_docs, shelf_docs, sku_catalog_doc, station_docs, warehouse_map
+from services import task_service
+from services.task_service import generate_putaway_tasks, generate_wave_tasks
+from utils import mongo_utils
+
+
+async def seed_warehouse(order_lines: int, shelves: int, orders: int = 1):
+    map_doc = warehouse_map(shelves, robots=order_lines // 3 + 4, stations=4)
+    map_id = str((await mongo_utils.maps_collection.insert_one(map_doc)).inserted_id)
+    sku_ids = [f"SKU{i}" for i in range(order_lines)]
+    await mongo_utils.sku_collection.insert_one(sku_catalog_doc(sku_ids))
+    await mongo_utils.shelf_status.insert_many(shelf_docs(map_id, shelves))
+    await mongo_utils.robot_status.insert_many(robot_docs(map_doc, map_id))
+    await mongo_utils.putaway_station.insert_many(station_docs(map_doc, map_id))
+    per_order = -(-order_lines // orders)
+    await mongo_utils.putaway_orders.insert_many([
+        putaway_order(map_id, sku_ids[i:i + per_order], code=f"BENCH{i:04d}") for i in range(0, order_lines, per_order)
+    ])
+    return map_id
+
+
+@pytest.mark.parametrize("order_lines,shelves", [(5, 100), (50, 1000), (200, 5000)])
+@pytest.mark.parametrize("mode", ["proximity", "load_balanced"])
+def test_generate_putaway_tasks(benchmark, run, mode, order_lines, shelves):
+    run(seed_warehouse(order_lines, shelves))
+    benchmark.extra_info.update({"order_lines": order_lines, "shelves": shelves})
+
+    result = benchmark.pedantic(lambda: run(generate_putaway_tasks(mode)), rounds=5, warmup_rounds=1)
+
+    assert len(result["tasks"]) == order_lines
+
+
+async def reset_wave():
+    await mongo_utils.putaway_tasks.delete_many({})
+    await mongo_utils.putaway_orders.update_many({}, {"$set": {"status": "pending"}, "$unset": {"tasked_orders": ""}})
+    await mongo_utils.putaway_station.update_many({}, {"$set": {"queue_length": 0}})
+
+
+@pytest.mark.parametrize("order_lines,orders,shelves", [(60, 20, 1000), (300, 100, 5000)])
+def test_generate_wave_tasks(benchmark, run, order_lines, orders, shelves):
+    map_id = run(seed_warehouse(order_lines, shelves, orders))
+    benchmark.extra_info.update({"order_lines": order_lines, "orders": orders, "shelves": shelves})
+
+    result = benchmark.pedantic(
+        lambda: run(generate_wave_tasks(map_id)), setup=lambda: run(reset_wave()), rounds=5, warmup_rounds=1
+    )
+
+    assert result["orders"] == orders
+    assert len(result["tasks"]) == order_lines
+    assert len({task["station_id"] for task in result["tasks"]}) == 4
+
+
+async def generate_concurrently(calls: int):
+    return await asyncio.gather(*[generate_putaway_tasks("load_balanced") for _ in range(calls)], return_exceptions=True)
+
+
+@pytest.mark.parametrize("calls", [10, 50])
+def test_generate_putaway_tasks_concurrent(benchmark, run, calls):
+    # Every call turns the same 6-line order into tasks. 6 shelves hold 18 copies of it on whole levels
+    # and at most 20 with split lines; the remaining calls must be refused with 409, not overbooked
+    run(seed_warehouse(6, 6))
+    benchmark.extra_info.update({"calls": calls})
+
+    results = benchmark.pedantic(lambda: run(generate_concurrently(calls)), rounds=1)
+
+    succeeded = [result for result in results if isinstance(result, dict)]
+    refused = [result for result in results if not isinstance(result, dict)]
+    assert all(isinstance(error, HTTPException) and error.status_code == 409 for error in refused)
+    shelves = run(mongo_utils.shelf_status.find({}).to_list(length=None))
+    levels = [level for shelf in shelves for level in shelf["shelf_levels"].values()]
+    reserved = sum(entry["amount"] for level in levels for entry in level.get("reservations", []))
+    assert min(level["available_space"] for level in levels) >= 0
+    assert reserved == sum(task["amount"] for result in succeeded for task in result["tasks"])
+    assert min(calls, 18) <= len(succeeded) <= min(calls, 20)
+
+
+async def seed_small_wave(level_units: int, orders):
+    """One shelf with a single level holding level_units units, and one order document per {code: {sku: amount}}."""
+    map_doc = warehouse_map(1, robots=4, stations=2)
+    map_id = str((await mongo_utils.maps_collection.insert_one(map_doc)).inserted_id)
+    sku_ids = [sku_id for lines in orders.values() for sku_id in lines]
+    await mongo_utils.sku_collection.insert_one(sku_catalog_doc(sku_ids))
+    shelf = shelf_docs(map_id, 1)[0]
+    space = level_units * 100.0  # sku_item volume
+    shelf.update(available_space=space, shelf_capacity=space, shelf_levels={"ground": {"available_space": space, "sku_details": []}})
+    await mongo_utils.shelf_status.insert_one(shelf)
+    await mongo_utils.robot_status.insert_many(robot_docs(map_doc, map_id))
+    await mongo_utils.putaway_station.insert_many(station_docs(map_doc, map_id))
+    for code, lines in orders.items():
+        order = putaway_order(map_id, [], code=code)
+        order["body"]["orders"][0]["sku_items"] = [{"sku_id": sku_id, "amount": amount} for sku_id, amount in lines.items()]
+        await mongo_utils.putaway_orders.insert_one(order)
+    return map_id
+
+
+def test_wave_defers_an_order_without_holding_its_space(run):
+    # A cannot fit (A2 alone is too big); the space A1 took must go back so B fits
+    map_id = run(seed_small_wave(10, {"A": {"A1": 8, "A2": 50}, "B": {"B1": 5}}))
+
+    result = run(generate_wave_tasks(map_id))
+
+    assert [task["putaway_order_code"] for task in result["tasks"]] == ["B"]
+    assert [order["putaway_order_code"] for order in result["deferred_orders"]] == ["A"]
+    shelf = run(mongo_utils.shelf_status.find_one({}))
+    assert shelf["shelf_levels"]["ground"]["available_space"] == 500.0
+
+
+def test_wave_retries_an_order_with_unsaved_tasks(run, monkeypatch):
+    map_id = run(seed_small_wave(100, {"A": {"A1": 8, "A2": 5}, "B": {"B1": 5}}))
+    real_insert = task_service.insert_tasks
+
+    async def insert_failing_a2(tasks):
+        kept = [task for task in tasks if task["sku_id"] != "A2"]
+        inserted, failed = await real_insert(kept)
+        return inserted, failed + [{"task_id": task["task_id"], "error": "write error"} for task in tasks if task not in kept]
+
+    monkeypatch.setattr(task_service, "insert_tasks", insert_failing_a2)
+    result = run(generate_wave_tasks(map_id))
+
+    assert [task["putaway_order_code"] for task in result["tasks"]] == ["B"]
+    assert run(mongo_utils.putaway_tasks.distinct("putaway_order_code")) == ["B"]
+    shelf = run(mongo_utils.shelf_status.find_one({}))
+    assert shelf["shelf_levels"]["ground"]["available_space"] == 9500.0
+    order_a = run(mongo_utils.putaway_orders.find_one({"body.orders.order_details.putaway_order_code": "A"}))
+    assert order_a.get("status") != "tasks_generated"
+
+
+def level_state(run):
+    shelf = run(mongo_utils.shelf_status.find_one({}))
+    level = shelf["shelf_levels"]["ground"]
+    return level["available_space"], level.get("reservations", []), level["sku_details"]
+
+
+def test_finished_tasks_leave_the_reservations(run):
+    map_id = run(seed_small_wave(100, {"A": {"A1": 8, "A2": 5}}))
+    tasks = {task["sku_id"]: task for task in run(generate_wave_tasks(map_id))["tasks"]}
+    assert len(level_state(run)[1]) == 2
+
+    run(task_service.update_task_status(tasks["A1"]["task_id"], "in_progress"))
+    assert len(level_state(run)[1]) == 2
+    run(task_service.update_task_status(tasks["A1"]["task_id"], "completed"))
+    run(task_service.update_task_status(tasks["A2"]["task_id"], "failed"))
+
+    # A1 is stock on the level now; A2's space is free again
+    assert level_state(run) == (9200.0, [], [{"A1": 8}])
+
+
+def test_generation_releases_space_when_saving_fails(run, monkeypatch):
+    map_id = run(seed_small_wave(100, {"A": {"A1": 8}}))
+
+    async def failing_station_loads(map_id, tasks):
+        raise RuntimeError("station write failed")
+
+    monkeypatch.setattr(task_service, "save_station_loads", failing_station_loads)
+    with pytest.raises(RuntimeError):
+        run(generate_wave_tasks(map_id))
+
+    assert level_state(run)[:2] == (10000.0, [])
+    assert run(mongo_utils.putaway_tasks.count_documents({})) == 0
@@ -0,0 +1,97 @@
+# utils/assignment.py
+
+import numpy as np
+
+
+def hungarian(cost):
+    """
+    Minimum-cost assignment of every row to a distinct column (rows <= columns)
+    with the shortest-augmenting-path Hungarian algorithm, O(rows^2 * columns);
+    each inner step is one numpy pass over the columns. Returns the column of
+    each row.
+    """
+    cost = np.asarray(cost, dtype=float)
+    n, m = cost.shape
+    if n > m:
+        raise ValueError("hungarian needs at least as many columns as rows")
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    match = np.zeros(m + 1, dtype=np.int64)  # match[j]: 1-based row on column j, 0 if free
+    way = np.zeros(m + 1, dtype=np.int64)
+    for row in range(1, n + 1):
+        match[0] = row
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        used = np.zeros(m + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            free = ~used
+            free[0] = False
+            reduced = np.full(m + 1, np.inf)
+            reduced[1:] = cost[i0 - 1] - u[i0] - v[1:]
+            better = free & (reduced < minv)
+            minv[better] = reduced[better]
+            way[better] = j0
+            candidates = np.where(free, minv, np.inf)
+            j1 = int(np.argmin(candidates))
+            delta = candidates[j1]
+            u[match[used]] += delta
+            v[used] -= delta
+            minv[free] -= delta
+            j0 = j1
+            if match[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    assignment = np.empty(n, dtype=np.int64)
+    columns = np.nonzero(match[1:])[0]
+    assignment[match[1:][columns] - 1] = columns
+    return assignment
+
+
+def slot_costs(base, capacity, load_step: float):
+    """
+    Expand a tasks x robots cost matrix into tasks x slots: robot r gets
+    capacity[r] slots, its k-th costing k * load_step more, so spreading tasks
+    over robots is cheaper than stacking them. Returns (costs, robot of each slot).
+    """
+    slot_robot = np.repeat(np.arange(base.shape[1]), capacity)
+    slot_rank = np.concatenate([np.arange(c) for c in capacity]) if len(capacity) else np.zeros(0)
+    return base[:, slot_robot] + load_step * slot_rank, slot_robot
+
+
+def optimal_assignment(base, capacity, load_step: float):
+    """Robot per task (-1 when every slot is taken) minimizing the total slot cost."""
+    costs, slot_robot = slot_costs(base, capacity, load_step)
+    tasks, slots = costs.shape
+    assignment = np.full(tasks, -1, dtype=np.int64)
+    if not tasks or not slots:
+        return assignment
+    if tasks <= slots:
+        assignment[:] = slot_robot[hungarian(costs)]
+    else:
+        # More tasks than slots: give each slot a distinct task, the rest stay unassigned
+        task_of_slot = hungarian(costs.T)
+        assignment[task_of_slot] = slot_robot
+    return assignment
+
+
+def greedy_assignment(base, capacity, load_step: float):
+    """Cheapest-first fallback for sizes the Hungarian step is too slow for: each task takes its best robot left."""
+    tasks, robots = base.shape
+    taken = np.zeros(robots)
+    capacity = np.asarray(capacity, dtype=float)
+    assignment = np.full(tasks, -1, dtype=np.int64)
+    if not robots:
+        return assignment
+    for task in np.argsort(base.min(axis=1), kind="stable"):
+        cost = np.where(taken < capacity, base[task] + load_step * taken, np.inf)
+        robot = int(np.argmin(cost))
+        if np.isinf(cost[robot]):
+            break
+        assignment[task] = robot
+        taken[robot] += 1
+    return assignment
@@ -0,0 +1,183 @@
+# utils/fleet_state.py
+
+import numpy as np
+
+STATUSES = ["idle", "busy"]
+IDLE, BUSY = 0, 1
+
+
+class FleetState:
+    """
+    Column store for every robot of one map.
+
+    Row i of each array describes robot ids[i]: position (row, col) as floats,
+    status code (index into STATUSES), battery level (NaN until the robot
+    reports one), assigned task index (-1 when none) and progress along its
+    planned path. Paths of all robots live
+    in one concatenated cell buffer addressed by path_start/path_len, so step()
+    can advance the whole fleet with array arithmetic instead of a loop.
+    """
+
+    def __init__(self, speed: float = 1.0, drain_per_cell: float = 0.01, idle_drain_per_second: float = 0.0):
+        self.speed = speed
+        self.drain_per_cell = drain_per_cell
+        self.idle_drain_per_second = idle_drain_per_second
+        self.ids = []
+        self.index = {}
+        self.map_ids = []
+        self.position = np.zeros((0, 2), dtype=np.float64)
+        self.status = np.zeros(0, dtype=np.int8)
+        self.battery = np.zeros(0, dtype=np.float32)
+        self.task_index = np.zeros(0, dtype=np.int32)
+        self.progress = np.zeros(0, dtype=np.float64)
+        self.path_start = np.zeros(0, dtype=np.int64)
+        self.path_len = np.zeros(0, dtype=np.int32)
+        self.dirty = np.zeros(0, dtype=bool)
+        self._cells = np.zeros((0, 2), dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Loading and exporting
+
+    @classmethod
+    def from_docs(cls, docs, **kwargs):
+        fleet = cls(**kwargs)
+        fleet.upsert_docs(docs, mark_dirty=False)
+        return fleet
+
+    def _grow(self, count: int):
+        self.position = np.concatenate([self.position, np.zeros((count, 2))])
+        self.status = np.concatenate([self.status, np.zeros(count, dtype=np.int8)])
+        self.battery = np.concatenate([self.battery, np.full(count, np.nan, dtype=np.float32)])
+        self.task_index = np.concatenate([self.task_index, np.full(count, -1, dtype=np.int32)])
+        self.progress = np.concatenate([self.progress, np.zeros(count)])
+        self.path_start = np.concatenate([self.path_start, np.zeros(count, dtype=np.int64)])
+        self.path_len = np.concatenate([self.path_len, np.zeros(count, dtype=np.int32)])
+        self.dirty = np.concatenate([self.dirty, np.zeros(count, dtype=bool)])
+
+    def upsert_docs(self, docs, mark_dirty: bool = True):
+        """Apply robot_status / RobotHeartbeat shaped dicts in one pass; unknown robots are appended."""
+        docs = list(docs)
+        new = [d["robot_id"] for d in docs if d["robot_id"] not in self.index]
+        if new:
+            start = len(self.ids)
+            for offset, robot_id in enumerate(dict.fromkeys(new)):
+                self.index[robot_id] = start + offset
+                self.ids.append(robot_id)
+                self.map_ids.append(None)
+            self._grow(len(self.ids) - start)
+
+        rows = np.fromiter((self.index[d["robot_id"]] for d in docs), dtype=np.int64, count=len(docs))
+        if not len(rows):
+            return rows
+        self.position[rows, 0] = [d["location"]["x"] for d in docs]
+        self.position[rows, 1] = [d["location"]["y"] for d in docs]
+        self.status[rows] = [STATUSES.index(d["status"]) for d in docs]
+        battery = [d.get("battery_level") for d in docs]
+        has_battery = np.array([b is not None for b in battery])
+        if has_battery.any():
+            self.battery[rows[has_battery]] = [b for b in battery if b is not None]
+        for row, doc in zip(rows, docs):
+            self.map_ids[row] = doc.get("map_id")
+        if mark_dirty:
+            self.dirty[rows] = True
+        return rows
+
+    def to_docs(self, rows=None):
+        """RobotHeartbeat shaped dicts (plus battery_level when known) for the given rows, all robots by default."""
+        if rows is None:
+            rows = np.arange(len(self.ids))
+        cells = np.rint(self.position[rows]).astype(int).tolist()
+        statuses = self.status[rows].tolist()
+        battery = self.battery[rows].tolist()
+        known = (~np.isnan(self.battery[rows])).tolist()
+        docs = []
+        for row, cell, status, level, has_level in zip(rows.tolist(), cells, statuses, battery, known):
+            doc = {
+                "robot_id": self.ids[row],
+                "status": STATUSES[status],
+                "location": {"x": cell[0], "y": cell[1]},
+                "map_id": self.map_ids[row]
+            }
+            if has_level:
+                doc["battery_level"] = round(level, 2)
+            docs.append(doc)
+        return docs
+
+    def take_dirty(self):
+        """Rows changed since the last call, clearing the flags."""
+        rows = np.flatnonzero(self.dirty)
+        self.dirty[rows] = False
+        return rows
+
+    def rows_with_status(self, status: int):
+        return np.flatnonzero(self.status == status)
+
+    # Paths
+
+    def assign_paths(self, robot_ids, paths, task_indexes=None):
+        """Give robots a path of (row, col) cells to follow from the first cell; they turn busy."""
+        rows = np.array([self.index[robot_id] for robot_id in robot_ids], dtype=np.int64)
+        lengths = np.array([len(path) for path in paths], dtype=np.int32)
+        self._compact()
+        offset = len(self._cells)
+        if lengths.sum():
+            self._cells = np.concatenate([self._cells, np.concatenate([np.asarray(p, dtype=np.float64) for p in paths if len(p)])])
+        self.path_start[rows] = offset + np.concatenate([[0], np.cumsum(lengths)[:-1]])
+        self.path_len[rows] = lengths
+        self.progress[rows] = 0.0
+        moving = lengths > 0
+        self.status[rows[moving]] = BUSY
+        self.position[rows[moving]] = self._cells[self.path_start[rows[moving]]]
+        if task_indexes is not None:
+            self.task_index[rows] = task_indexes
+        self.dirty[rows] = True
+
+    def _compact(self):
+        live = self.path_len.sum()
+        if len(self._cells) <= 2 * live + 1024:
+            return
+        active = np.flatnonzero(self.path_len > 0)
+        pieces = [self._cells[self.path_start[r]:self.path_start[r] + self.path_len[r]] for r in active]
+        self._cells = np.concatenate(pieces) if pieces else np.zeros((0, 2))
+        self.path_start[active] = np.concatenate([[0], np.cumsum(self.path_len[active])[:-1]]).astype(np.int64)
+
+    # Simulation
+
+    def step(self, dt: float):
+        """
+        Advance every moving robot by speed * dt cells along its path.
+        Robots reaching their last cell turn idle and drop their task; returns
+        the rows that arrived during this step.
+        """
+        moving = (self.path_len > 0) & (self.status == BUSY)
+        if self.idle_drain_per_second:
+            self.battery -= np.float32(self.idle_drain_per_second * dt)
+        if not moving.any():
+            np.clip(self.battery, 0, 100, out=self.battery)
+            return np.zeros(0, dtype=np.int64)
+
+        rows = np.flatnonzero(moving)
+        last = (self.path_len[rows] - 1).astype(np.float64)
+        before = self.progress[rows]
+        after = np.minimum(before + self.speed * dt, last)
+        self.progress[rows] = after
+
+        segment = np.floor(after).astype(np.int64)
+        nxt = np.minimum(segment + 1, last.astype(np.int64))
+        frac = (after - segment)[:, None]
+        base = self.path_start[rows]
+        a = self._cells[base + segment]
+        b = self._cells[base + nxt]
+        self.position[rows] = a + (b - a) * frac
+
+        self.battery[rows] -= ((after - before) * self.drain_per_cell).astype(np.float32)
+        np.clip(self.battery, 0, 100, out=self.battery)
+
+        arrived = rows[after >= last]
+        self.status[arrived] = IDLE
+        self.task_index[arrived] = -1
+        self.path_len[arrived] = 0
+        self.dirty[rows] = True
+        return arrived
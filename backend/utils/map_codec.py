@@ -0,0 +1,162 @@
+# utils/map_codec.py
+
+import hashlib
+import struct
+
+MAGIC = b"AMRM"
+VERSION = 1
+MAP_MEDIA_TYPE = "application/vnd.amr-map"
+
+
+def default_component_id(component_type: str, row: int, col: int):
+    # Same scheme as the map editor (frontend/src/components/MapSimulation.jsx)
+    return f"{component_type.lower()}-{row}-{col}"
+
+
+def _put_varint(out: bytearray, value: int):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _get_varint(data, pos: int):
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _put_str(out: bytearray, text: str):
+    raw = text.encode("utf-8")
+    _put_varint(out, len(raw))
+    out += raw
+
+
+def _get_str(data, pos: int):
+    length, pos = _get_varint(data, pos)
+    return bytes(data[pos:pos + length]).decode("utf-8"), pos + length
+
+
+def encode_map(map_doc):
+    """
+    Binary form of a map: header (name, rows, cols) followed by one layer per
+    component type. A layer stores its cells as run-length encoded runs over
+    row-major cell indexes, so walls and shelf rows collapse to a few bytes.
+    Component order within a type (it decides the R1/S1/ST1 numbering) is kept
+    as a permutation only when it differs from row-major order, and only ids
+    that differ from default_component_id are stored.
+
+    Two components of one type on the same cell go to a second layer of that
+    type. Raises ValueError for components outside the grid.
+    """
+    rows, cols = map_doc.get("rows", 0), map_doc.get("cols", 0)
+    layers, layer_of = [], {}
+    for c in map_doc.get("components", []):
+        row, col = c["row"], c["col"]
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise ValueError(f"Component {c.get('id')} at ({row}, {col}) is outside the {rows}x{cols} grid")
+        index = row * cols + col
+        type_layers = layer_of.setdefault(c["type"], [])
+        layer = next((l for l in type_layers if index not in l["seen"]), None)
+        if layer is None:
+            layer = {"type": c["type"], "cells": [], "ids": [], "seen": set()}
+            type_layers.append(layer)
+            layers.append(layer)
+        layer["cells"].append(index)
+        layer["ids"].append(c.get("id"))
+        layer["seen"].add(index)
+
+    out = bytearray(MAGIC)
+    out += struct.pack("<BII", VERSION, rows, cols)
+    _put_str(out, map_doc.get("name", ""))
+    _put_varint(out, len(layers))
+    for layer in layers:
+        _put_str(out, layer["type"])
+        cells = layer["cells"]
+        ordered = sorted(cells)
+        runs, prev_end = [], 0
+        for index in ordered:
+            if runs and index == runs[-1][0] + runs[-1][1]:
+                runs[-1][1] += 1
+            else:
+                runs.append([index, 1])
+        _put_varint(out, len(runs))
+        for start, length in runs:
+            _put_varint(out, start - prev_end)
+            _put_varint(out, length)
+            prev_end = start + length
+
+        if cells == ordered:
+            out.append(0)
+        else:
+            out.append(1)
+            rank = {index: i for i, index in enumerate(ordered)}
+            for index in cells:
+                _put_varint(out, rank[index])
+
+        exceptions = [
+            (i, component_id) for i, (index, component_id) in enumerate(zip(cells, layer["ids"]))
+            if component_id != default_component_id(layer["type"], *divmod(index, cols))
+        ]
+        _put_varint(out, len(exceptions))
+        for i, component_id in exceptions:
+            _put_varint(out, i)
+            _put_str(out, component_id or "")
+    return bytes(out)
+
+
+def decode_map(data):
+    """Inverse of encode_map; components come back grouped by type, each type in its original order."""
+    if bytes(data[:4]) != MAGIC:
+        raise ValueError("Not an encoded map")
+    version, rows, cols = struct.unpack_from("<BII", data, 4)
+    if version != VERSION:
+        raise ValueError(f"Unsupported map encoding version {version}")
+    name, pos = _get_str(data, 13)
+    layer_count, pos = _get_varint(data, pos)
+
+    components = []
+    for _ in range(layer_count):
+        component_type, pos = _get_str(data, pos)
+        run_count, pos = _get_varint(data, pos)
+        ordered, prev_end = [], 0
+        for _ in range(run_count):
+            gap, pos = _get_varint(data, pos)
+            length, pos = _get_varint(data, pos)
+            start = prev_end + gap
+            ordered.extend(range(start, start + length))
+            prev_end = start + length
+
+        has_order = data[pos]
+        pos += 1
+        cells = ordered
+        if has_order:
+            cells = []
+            for _ in ordered:
+                rank, pos = _get_varint(data, pos)
+                cells.append(ordered[rank])
+
+        ids = {}
+        exception_count, pos = _get_varint(data, pos)
+        for _ in range(exception_count):
+            i, pos = _get_varint(data, pos)
+            ids[i], pos = _get_str(data, pos)
+
+        for i, index in enumerate(cells):
+            row, col = divmod(index, cols)
+            components.append({
+                "id": ids.get(i, default_component_id(component_type, row, col)),
+                "type": component_type,
+                "row": row,
+                "col": col
+            })
+    return {"name": name, "rows": rows, "cols": cols, "components": components}
+
+
+def content_hash(data: bytes):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
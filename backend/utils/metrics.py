@@ -0,0 +1,100 @@
+# utils/metrics.py
+
+import time
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import monitoring
+from starlette.routing import Match
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ["router", "method", "route", "status"]
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being handled", ["router"])
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency", ["database", "collection", "command", "outcome"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+TASKS_GENERATED = Counter("putaway_tasks_generated", "Putaway tasks created", ["mode"])
+PLACEMENT_FAILURES = Counter("putaway_placement_failures", "Order lines that did not fit on any shelf level")
+SHELF_RESERVATION_CONFLICTS = Counter(
+    "shelf_reservation_conflicts", "Task reservations refused because their shelf level filled up concurrently"
+)
+IDLE_ROBOTS = Gauge("idle_robots", "Idle robots per map (maps loaded in the fleet store)", ["map_id"])
+
+
+def router_label(route):
+    # controllers/<name>_controller.py defines the router main.py includes as <name>_router
+    module = getattr(getattr(route, "endpoint", None), "__module__", "") or ""
+    name = module.rsplit(".", 1)[-1]
+    return name[:-len("_controller")] + "_router" if name.endswith("_controller") else "app"
+
+
+class MetricsMiddleware:
+    """
+    Request latency and in-flight requests per router. A plain ASGI
+    middleware, so streamed responses (SSE, SKU imports) pass through as they
+    are. The route is resolved up front, the same way the router will, so the
+    in-flight gauge knows its router before the handler runs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._labels = {}
+
+    def _resolve(self, scope):
+        for route in scope["app"].router.routes:
+            match, _ = route.matches(scope)
+            if match == Match.FULL:
+                # Routes define __eq__ without __hash__, so they are keyed by identity
+                key = id(route)
+                if key not in self._labels:
+                    self._labels[key] = (router_label(route), getattr(route, "path", ""))
+                return self._labels[key]
+        return "none", "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        router, route = self._resolve(scope)
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        in_flight = HTTP_REQUESTS_IN_FLIGHT.labels(router)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            in_flight.dec()
+            HTTP_REQUEST_SECONDS.labels(router, scope["method"], route, str(status[0])).observe(
+                time.perf_counter() - started
+            )
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """Command latency by database, collection and command, from the driver's own timings."""
+
+    def __init__(self):
+        self._collections = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        # getMore names its collection separately; commands like ping or hello have none
+        collection = event.command.get("collection") if event.command_name == "getMore" else target
+        self._collections[(event.connection_id, event.request_id)] = collection if isinstance(collection, str) else ""
+
+    def _observe(self, event, outcome: str):
+        collection = self._collections.pop((event.connection_id, event.request_id), "")
+        MONGO_COMMAND_SECONDS.labels(event.database_name, collection, event.command_name, outcome).observe(
+            event.duration_micros / 1e6
+        )
+
+    def succeeded(self, event):
+        self._observe(event, "success")
+
+    def failed(self, event):
+        self._observe(event, "failure")
@@ -4,12 +4,13 @@ import os
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorClient
 from bson import ObjectId
+from utils.metrics import MongoCommandMetrics
 
 load_dotenv()
 
 # MongoDB connection setup
 MONGO_URI = os.getenv("MONGO_URI")
-client = AsyncIOMotorClient(MONGO_URI)
+client = AsyncIOMotorClient(MONGO_URI, event_listeners=[MongoCommandMetrics()])
 
 # Database references
 db_station = client["station_db"]
@@ -45,6 +46,11 @@ db_map = client["map"]  # Database name
 maps_collection = db_map["map"]  # Collection name
 
 
+# Projection for an endpoint's fields, optionally narrowed by a comma-separated ?fields= list
+def field_projection(allowed, fields: str = None):
+    wanted = [f.strip() for f in fields.split(",") if f.strip() in allowed] if fields else []
+    return {field: 1 for field in (wanted or allowed)}
+
 # Utility function for ObjectId conversion
 def mongo_to_dict(mongo_obj):
     if isinstance(mongo_obj, ObjectId):
@@ -0,0 +1,228 @@
+# utils/multi_agent.py
+
+from collections import deque
+from utils.pathfinding import OccupancyGrid
+
+
+class ReservationTable:
+    """
+    Space-time reservations shared by every agent of a plan.
+
+    Cells are flat grid indexes and a (cell, t) pair is packed into the single
+    int t * size + cell. vertices holds occupied (cell, t) pairs, edges holds
+    moves keyed by their (to, t) pair and from cell so two robots can not swap
+    cells, and parked records the time from which a finished robot sits on its
+    last cell for good.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.vertices = set()
+        self.edges = set()
+        self.parked = {}
+        self.last_reserved = {}
+
+    def reserve_path(self, path, park: bool = True):
+        size = self.size
+        for t, cell in enumerate(path):
+            self.vertices.add(t * size + cell)
+            if t:
+                self.edges.add((t * size + cell) * size + path[t - 1])
+            if t > self.last_reserved.get(cell, -1):
+                self.last_reserved[cell] = t
+        if park and path:
+            self.parked[path[-1]] = len(path) - 1
+
+
+def _adjacency(grid: OccupancyGrid):
+    """Free 4-neighbours of every free cell, plus the cell itself for waiting."""
+    cols, rows, cells = grid.cols, grid.rows, grid.cells
+    adjacency = [()] * (rows * cols)
+    for index in range(rows * cols):
+        if cells[index]:
+            continue
+        row, col = divmod(index, cols)
+        moves = [index]
+        for nxt, ok in ((index - cols, row > 0), (index + cols, row < rows - 1),
+                        (index - 1, col > 0), (index + 1, col < cols - 1)):
+            if ok and not cells[nxt]:
+                moves.append(nxt)
+        adjacency[index] = tuple(moves)
+    return adjacency
+
+
+def _components(adjacency):
+    """Label the connected free regions so unreachable goals fail without a search."""
+    labels = [-1] * len(adjacency)
+    label = 0
+    for seed, moves in enumerate(adjacency):
+        if not moves or labels[seed] != -1:
+            continue
+        labels[seed] = label
+        queue = deque([seed])
+        while queue:
+            for nxt in adjacency[queue.popleft()]:
+                if labels[nxt] == -1:
+                    labels[nxt] = label
+                    queue.append(nxt)
+        label += 1
+    return labels
+
+
+def _space_time_astar(grid, adjacency, table, start, goal, t0, max_steps, final):
+    """
+    Wait-or-move path from start at time t0 to goal that respects the
+    reservation table, at most about twice as long as the shortest one. A
+    final leg must also be able to stay on its goal. Returns the cells for
+    t0..arrival (start included) or None.
+    """
+    cols, size = grid.cols, table.size
+    goal_row, goal_col = divmod(goal, cols)
+    start_row, start_col = divmod(start, cols)
+    parked = table.parked
+    parked_from = parked.get(goal)
+    if parked_from is not None and (final or parked_from <= t0 + abs(start_row - goal_row) + abs(start_col - goal_col)):
+        # Another robot has parked on the goal before we could get there (or stay there)
+        return None
+    final_from = table.last_reserved.get(goal, -1) if final else -1
+    vertices, edges = table.vertices, table.edges
+    horizon = t0 + max_steps
+    to_goal = {}
+    arrivals = {}
+
+    def first_free(at):
+        # The first step from at on which the goal cell is not reserved: no path can end there sooner
+        free_at = max(at, final_from)
+        while free_at * size + goal in vertices:
+            free_at += 1
+        arrivals[at] = free_at
+        return free_at
+
+    def estimate(cell, t):
+        h = to_goal.get(cell)
+        if h is None:
+            row, col = divmod(cell, cols)
+            h = to_goal[cell] = abs(row - goal_row) + abs(col - goal_col)
+        return 2 * (arrivals.get(t + h) or first_free(t + h)) - t
+
+    # Weighted A* with w = 2: f = t + 2 * (arrival - t). Delays still cost, but a leg no longer
+    # searches every state of one delay before trying the next. f is a small integer, so buckets
+    # replace a heap; popping the newest entry of the lowest bucket prefers the deepest states
+    f = estimate(start, t0)
+    buckets = {f: [(t0, t0 * size + start)]}
+    came_from = {t0 * size + start: None}
+    while True:
+        bucket = buckets.get(f)
+        if not bucket:
+            buckets.pop(f, None)
+            if not buckets:
+                return None
+            # f is the lowest bucket and keys are dense, so the next one is close above
+            f += 1
+            while f not in buckets:
+                f += 1
+            continue
+        t, state = bucket.pop()
+        cell = state - t * size
+        if cell == goal and t >= final_from:
+            path = []
+            while state is not None:
+                path.append(state % size)
+                state = came_from[state]
+            path.reverse()
+            return path
+        if t >= horizon:
+            continue
+        nt = t + 1
+        base = nt * size
+        for nxt in adjacency[cell]:
+            nstate = base + nxt
+            if nstate in came_from or nstate in vertices or (base + cell) * size + nxt in edges:
+                continue
+            if nxt in parked and nt >= parked[nxt]:
+                continue
+            came_from[nstate] = state
+            h = to_goal.get(nxt)
+            if h is None:
+                row, col = divmod(nxt, cols)
+                h = to_goal[nxt] = abs(row - goal_row) + abs(col - goal_col)
+            arrival = nt + h
+            if arrival < final_from or arrival * size + goal in vertices:
+                arrival = arrivals.get(arrival) or first_free(arrival)
+            nf = 2 * arrival - nt
+            if nf < f:
+                f = nf
+            if nf in buckets:
+                buckets[nf].append((nt, nstate))
+            else:
+                buckets[nf] = [(nt, nstate)]
+    return None
+
+
+def plan_prioritized(grid: OccupancyGrid, agents, max_steps: int = None):
+    """
+    Prioritized cooperative A* over the grid.
+
+    agents is a list of (agent_id, start_cell, [waypoint_cell, ...]) with
+    (row, col) cells. Agents with the longest routes plan first; each one
+    routes through its waypoints in order around the space-time reservations
+    of the agents before it, then parks on its last waypoint. Agents that have
+    not planned yet are treated as parked on their start; agents that found no
+    route get a second try after everyone else.
+
+    Returns (paths, unplanned): paths maps agent_id to its (row, col) cell at
+    every time step from 0, unplanned lists agents no collision-free route was
+    found for within max_steps per leg (they are parked at their start).
+    Raises ValueError for a start or waypoint off the grid.
+    """
+    cols = grid.cols
+    max_steps = max_steps or 2 * (grid.rows + grid.cols)
+    adjacency = _adjacency(grid)
+    labels = _components(adjacency)
+
+    legs, lengths = {}, {}
+    for agent_id, start, waypoints in agents:
+        if not all(grid.in_bounds(*cell) for cell in [start] + waypoints):
+            raise ValueError(f"Agent {agent_id} has a cell outside the {grid.rows}x{grid.cols} grid")
+        legs[agent_id] = [start[0] * cols + start[1]] + [r * cols + c for r, c in waypoints]
+        lengths[agent_id] = sum(abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in zip([start] + waypoints, waypoints))
+    order = sorted(agents, key=lambda a: -lengths[a[0]])
+
+    table = ReservationTable(grid.rows * grid.cols)
+    # Robots that have not planned yet stand still on their start cell
+    for agent_id, _, _ in agents:
+        table.parked[legs[agent_id][0]] = 0
+
+    def plan(stops):
+        table.parked.pop(stops[0], None)
+        route = [stops[0]]
+        for i, goal in enumerate(stops[1:], start=1):
+            leg = None
+            if adjacency[goal] and labels[goal] == labels[route[-1]]:
+                leg = _space_time_astar(
+                    grid, adjacency, table, route[-1], goal, len(route) - 1, max_steps, final=i == len(stops) - 1
+                )
+            if leg is None:
+                table.parked[stops[0]] = 0
+                return None
+            route.extend(leg[1:])
+        table.reserve_path(route)
+        return route
+
+    paths, failed = {}, []
+    for agent_id, _, _ in order:
+        route = plan(legs[agent_id])
+        if route is None:
+            failed.append(agent_id)
+        else:
+            paths[agent_id] = [divmod(cell, cols) for cell in route]
+    # A robot boxed in by others still waiting on their start cells often gets out once they have left
+    unplanned = []
+    for agent_id in failed:
+        route = plan(legs[agent_id])
+        if route is None:
+            unplanned.append(agent_id)
+            route = [legs[agent_id][0]]
+            table.reserve_path(route)
+        paths[agent_id] = [divmod(cell, cols) for cell in route]
+    return paths, unplanned
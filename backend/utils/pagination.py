@@ -0,0 +1,42 @@
+# utils/pagination.py
+
+import base64
+import binascii
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException
+
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(last_id: ObjectId):
+    return base64.urlsafe_b64encode(last_id.binary).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return ObjectId(raw)
+    except (binascii.Error, InvalidId, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def paginate(collection, query=None, projection=None, cursor: str = None, limit: int = 100):
+    """
+    One page in _id order starting after cursor. The query is an index seek on
+    _id (or on a {filter..., _id} compound index) whatever the page depth.
+    Returns (docs, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = dict(query or {})
+    if cursor:
+        query["_id"] = {"$gt": decode_cursor(cursor)}
+    # One extra document tells whether another page exists
+    docs = await collection.find(query, projection).sort("_id", 1).limit(limit + 1).to_list(length=limit + 1)
+    next_cursor = encode_cursor(docs[limit - 1]["_id"]) if len(docs) > limit else None
+    return docs[:limit], next_cursor
+
+
+def page_body(items, next_cursor):
+    """Body of every paginated list endpoint; next_cursor is null on the last page."""
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,169 @@
+# utils/pathfinding.py
+
+import heapq
+import numpy as np
+
+# Component types robots cannot drive through (same rule as frontend/src/utils/pathfinding.js)
+BLOCKED_TYPES = {"Obstacle"}
+
+
+class OccupancyGrid:
+    """Row-major bitmap of a map: one byte per cell, 1 where the cell is blocked."""
+
+    def __init__(self, rows: int, cols: int, blocked=None):
+        self.rows = rows
+        self.cols = cols
+        self.cells = bytearray(rows * cols)
+        for row, col in blocked or []:
+            if self.in_bounds(row, col):
+                self.cells[row * cols + col] = 1
+
+    def in_bounds(self, row: int, col: int):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_free(self, row: int, col: int):
+        return self.in_bounds(row, col) and not self.cells[row * self.cols + col]
+
+
+def build_occupancy_grid(map_doc):
+    blocked = [(c["row"], c["col"]) for c in map_doc.get("components", []) if c.get("type") in BLOCKED_TYPES]
+    return OccupancyGrid(map_doc.get("rows", 0), map_doc.get("cols", 0), blocked)
+
+
+def component_positions(map_doc, component_type: str, prefix: str):
+    """
+    Map generated ids to cells, numbering components of one type in map order
+    the same way the frontend does when it seeds robots (R1..), shelves (S1..)
+    and stations (ST1..).
+    """
+    positions = {}
+    for c in map_doc.get("components", []):
+        if c.get("type", "").lower() == component_type.lower():
+            positions[f"{prefix}{len(positions) + 1}"] = (c["row"], c["col"])
+    return positions
+
+
+def _neighbors(grid: OccupancyGrid, index: int):
+    cols = grid.cols
+    row, col = divmod(index, cols)
+    cells = grid.cells
+    if row > 0 and not cells[index - cols]:
+        yield index - cols
+    if row < grid.rows - 1 and not cells[index + cols]:
+        yield index + cols
+    if col > 0 and not cells[index - 1]:
+        yield index - 1
+    if col < cols - 1 and not cells[index + 1]:
+        yield index + 1
+
+
+def _astar(grid: OccupancyGrid, start, goal, limit=None):
+    if not grid.in_bounds(*start) or not grid.in_bounds(*goal):
+        return None, None
+    cols = grid.cols
+    start_i = start[0] * cols + start[1]
+    goal_i = goal[0] * cols + goal[1]
+    goal_row, goal_col = goal
+
+    g_score = {start_i: 0}
+    came_from = {}
+    # Ties on f go to the deeper node (-g), which keeps open-floor searches close to a straight line
+    open_heap = [(abs(start[0] - goal_row) + abs(start[1] - goal_col), 0, start_i)]
+    while open_heap:
+        f, neg_g, current = heapq.heappop(open_heap)
+        g = -neg_g
+        if current == goal_i:
+            return g, came_from
+        if g > g_score[current]:
+            continue
+        if limit is not None and f >= limit:
+            break
+        for nxt in _neighbors(grid, current):
+            ng = g + 1
+            if ng < g_score.get(nxt, ng + 1):
+                g_score[nxt] = ng
+                came_from[nxt] = current
+                row, col = divmod(nxt, cols)
+                heapq.heappush(open_heap, (ng + abs(row - goal_row) + abs(col - goal_col), -ng, nxt))
+    return None, None
+
+
+def grid_distance(grid: OccupancyGrid, start, goal, limit=None):
+    """Length of the shortest 4-connected path, or None if unreachable (or not shorter than limit)."""
+    distance, _ = _astar(grid, start, goal, limit)
+    return distance
+
+
+def find_path(grid: OccupancyGrid, start, goal):
+    """Shortest 4-connected path as a list of (row, col) cells including both ends, [] if unreachable."""
+    distance, came_from = _astar(grid, start, goal)
+    if distance is None:
+        return []
+    cols = grid.cols
+    index = goal[0] * cols + goal[1]
+    start_i = start[0] * cols + start[1]
+    path = [divmod(index, cols)]
+    while index != start_i:
+        index = came_from[index]
+        path.append(divmod(index, cols))
+    path.reverse()
+    return path
+
+
+def distance_matrix(grid: OccupancyGrid, sources, targets, batch_size: int = 64):
+    """
+    Shortest 4-connected path lengths from each source cell to each target
+    cell, shape (len(sources), len(targets)); -1 where unreachable. A
+    breadth-first search per source that only touches its frontier: a batch
+    of sources advances together, one numpy step per distance ring, and
+    stops as soon as every target has been reached.
+    """
+    result = np.full((len(sources), len(targets)), -1, dtype=np.int32)
+    inside = [k for k, (row, col) in enumerate(targets) if grid.in_bounds(row, col)]
+    if not inside or not sources:
+        return result
+    # A blocked border around the grid (and between the copies of a batch) replaces bounds checks
+    width = grid.cols + 2
+    cells = (grid.rows + 2) * width
+    free = np.zeros((grid.rows + 2, width), dtype=bool)
+    free[1:-1, 1:-1] = np.frombuffer(bytes(grid.cells), dtype=np.uint8).reshape(grid.rows, grid.cols) == 0
+    free = free.ravel()
+    # Targets sharing a cell share a slot
+    target_cells, target_slot = np.unique(
+        np.array([(targets[k][0] + 1) * width + targets[k][1] + 1 for k in inside], dtype=np.int64),
+        return_inverse=True
+    )
+    slot_at = np.full(cells, -1, dtype=np.int64)
+    slot_at[target_cells] = np.arange(len(target_cells))
+    batch_size = max(1, min(batch_size, (1 << 22) // cells))
+    for first in range(0, len(sources), batch_size):
+        batch = [(first + k, (row + 1) * width + col + 1)
+                 for k, (row, col) in enumerate(sources[first:first + batch_size]) if grid.in_bounds(row, col)]
+        if not batch:
+            continue
+        # Source b's copy of cell i is b * cells + i; open marks cells not reached yet
+        is_target = np.tile(slot_at >= 0, len(batch))
+        open_cells = np.tile(free, len(batch))
+        claim = np.empty(len(batch) * cells, dtype=np.int32)
+        frontier = np.array([b * cells + start for b, (_, start) in enumerate(batch)], dtype=np.int64)
+        open_cells[frontier] = False
+        found = np.full((len(batch), len(target_cells)), -1, dtype=np.int32)
+        remaining = found.size
+        step = 0
+        while len(frontier):
+            hits = frontier[is_target[frontier]]
+            if len(hits):
+                found[hits // cells, slot_at[hits % cells]] = step
+                remaining -= len(hits)
+                if not remaining:
+                    break
+            grown = np.concatenate([frontier - width, frontier + width, frontier - 1, frontier + 1])
+            grown = grown[open_cells[grown]]
+            # Keep one copy of cells reached from two sides
+            claim[grown] = np.arange(len(grown), dtype=np.int32)
+            grown = grown[claim[grown] == np.arange(len(grown), dtype=np.int32)]
+            open_cells[grown] = False
+            frontier = grown
+            step += 1
+        result[np.ix_([k for k, _ in batch], inside)] = found[:, target_slot]
+    return result
@@ -0,0 +1,207 @@
+# utils/profiling.py
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from urllib.parse import parse_qs
+
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "false").lower() in ("1", "true", "yes")
+# Samples need the GIL, which the loop thread hands over every sys.getswitchinterval() (5 ms) at most
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+PROFILE_HISTORY = int(os.getenv("PROFILE_HISTORY", 20))
+PROFILE_HEADER = "X-Profile-Id"
+
+CPU_ROOT = "[cpu]"
+AWAIT_ROOT = "[await]"
+
+
+def _label(frame):
+    code = frame.f_code
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _thread_stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_label(frame))
+        frame = frame.f_back
+    return labels[::-1]
+
+
+def _await_stack(coro):
+    """Where a suspended coroutine waits: its chain of awaits down to the awaited future."""
+    labels = []
+    while coro is not None:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            labels.append(type(coro).__name__)
+            break
+        labels.append(_label(frame))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return labels
+
+
+class RequestSampler:
+    """
+    Samples the event loop thread every interval seconds while one request runs.
+
+    A sample taken while the loop is executing a task is CPU time and records
+    the thread's Python stack. A sample taken while no task is running means
+    the loop is waiting, so it records where the profiled request's coroutine
+    is suspended instead (a Motor call shows up as the executor Future it
+    awaits). Concurrent requests share the loop, so their CPU time appears too.
+    """
+
+    def __init__(self, task: asyncio.Task, interval: float = PROFILE_INTERVAL):
+        self.task = task
+        self.loop = task.get_loop()
+        self.loop_thread = threading.get_ident()
+        self.interval = interval
+        self.samples = []
+        self.weights = []
+        self.started = self.finished = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-sampler", daemon=True)
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.loop_thread)
+            if asyncio.current_task(self.loop) is None:
+                stack = (AWAIT_ROOT, *_await_stack(self.task.get_coro()))
+            else:
+                stack = (CPU_ROOT, *_thread_stack(frame))
+            now = time.perf_counter()
+            self.samples.append(stack)
+            self.weights.append(now - last)
+            last = now
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+        self.finished = time.perf_counter()
+
+
+class RequestProfile:
+    def __init__(self, profile_id: str, name: str, sampler: RequestSampler):
+        self.profile_id = profile_id
+        self.name = name
+        self.samples = sampler.samples
+        self.weights = sampler.weights
+        self.duration = sampler.finished - sampler.started
+        self.created_at = time.time()
+
+    def summary(self):
+        cpu = sum(w for stack, w in zip(self.samples, self.weights) if stack[0] == CPU_ROOT)
+        waiting = sum(w for stack, w in zip(self.samples, self.weights) if stack[0] == AWAIT_ROOT)
+        return {
+            "profile_id": self.profile_id,
+            "request": self.name,
+            "created_at": self.created_at,
+            "duration": round(self.duration, 6),
+            "samples": len(self.samples),
+            "cpu_seconds": round(cpu, 6),
+            "await_seconds": round(waiting, 6)
+        }
+
+    def collapsed(self):
+        """Brendan Gregg's collapsed stack format; counts are microseconds so unequal sample gaps add up right."""
+        totals = Counter()
+        for stack, weight in zip(self.samples, self.weights):
+            totals[";".join(stack)] += weight
+        return "".join(f"{stack} {round(seconds * 1e6)}\n" for stack, seconds in totals.most_common())
+
+    def speedscope(self):
+        frames, index = [], {}
+        samples = []
+        for stack in self.samples:
+            for label in stack:
+                if label not in index:
+                    index[label] = len(frames)
+                    name, _, where = label.partition(" (")
+                    file, _, line = where.rstrip(")").rpartition(":")
+                    frames.append({"name": name, "file": file, "line": int(line)} if file else {"name": label})
+            samples.append([index[label] for label in stack])
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": frames},
+            "profiles": [{
+                "type": "sampled",
+                "name": self.name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(self.weights),
+                "samples": samples,
+                "weights": self.weights
+            }],
+            "name": self.name,
+            "exporter": "amr-sim"
+        }
+
+
+class ProfileStore:
+    """The last PROFILE_HISTORY request profiles, by id."""
+
+    def __init__(self, maxsize: int = PROFILE_HISTORY):
+        self.maxsize = maxsize
+        self._profiles = OrderedDict()
+
+    def add(self, profile: RequestProfile):
+        self._profiles[profile.profile_id] = profile
+        while len(self._profiles) > self.maxsize:
+            self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str):
+        return self._profiles.get(profile_id)
+
+    def list(self):
+        return [profile.summary() for profile in reversed(self._profiles.values())]
+
+
+profile_store = ProfileStore()
+
+
+def wants_profile(scope):
+    for name, value in scope.get("headers", []):
+        if name == b"x-profile" and value.lower() in (b"1", b"true"):
+            return True
+    flag = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile", [""])[-1]
+    return flag.lower() in ("1", "true")
+
+
+class ProfilingMiddleware:
+    """
+    Profiles the requests that ask for it (X-Profile: 1 header or ?profile=1)
+    and returns the profile id in the X-Profile-Id response header. Only added
+    to the app when PROFILING_ENABLED is set, so otherwise it costs nothing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile_id.encode("ascii"))]
+            await send(message)
+
+        sampler = RequestSampler(asyncio.current_task())
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            sampler.stop()
+            profile_store.add(RequestProfile(profile_id, f"{scope['method']} {scope['path']}", sampler))
@@ -0,0 +1,38 @@
+# utils/responses.py
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def _encode_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class MongoJSONResponse(JSONResponse):
+    """
+    JSON response for raw Mongo documents. Services return documents as Motor
+    reads them; ObjectIds are turned into strings by orjson while it encodes,
+    so documents are not walked and rebuilt first (mongo_to_dict /
+    serialize_dict). Return it from the endpoint directly: a returned dict
+    would still go through FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content):
+        return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+class BodyStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for generators that keep reading the request body while
+    they respond. The stock class listens for a client disconnect on receive()
+    at the same time, which would swallow the body messages the generator is
+    waiting for; a disconnect still surfaces as an error on the next send.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
@@ -0,0 +1,155 @@
+# utils/shelf_index.py
+
+from bisect import bisect_left, insort
+
+# Level preference when two levels have the same free space
+LEVEL_ORDER = ["third", "second", "ground"]
+
+OPEN, CLOSED = 0, 1
+
+
+class ShelfBinPacker:
+    """
+    Places order lines on shelf levels as a bin-packing problem.
+
+    Each level is a bin with a volume (available_space) and a height class
+    (max_height; levels without one fit anything). Lines are packed together,
+    largest total volume first, and each goes to the tightest level that
+    holds the whole line (best fit decreasing). Shelves already used by this
+    packer are "open" and are tried before any other shelf, which keeps the
+    number of distinct shelves a wave visits low. A line that no single level
+    can hold is split over the roomiest levels until the rest fits in one.
+    A line is placed whole or not at all: one that does not fit is left
+    unplaced without taking anything, so it cannot starve the lines after it.
+
+    Levels sit in sorted lists per (open/closed, height class), so a lookup
+    is a bisect per height class and an update is one list delete + insert.
+    The shelf documents are updated in place as space is reserved, and the
+    packer keeps its state between pack() calls.
+    """
+
+    def __init__(self, shelves):
+        self._shelves = list(shelves)
+        self._pools = ({}, {})
+        self._where = {}
+        self._opened = set()
+        self._free = {}
+        for shelf_pos, shelf in enumerate(self._shelves):
+            for level_name, level in (shelf.get("shelf_levels") or {}).items():
+                if not level or "available_space" not in level:
+                    continue
+                max_height = level.get("max_height", float('inf'))
+                self._pools[CLOSED].setdefault(max_height, []).append(self._key(shelf_pos, level_name))
+                self._where[(shelf_pos, level_name)] = max_height
+                self._free[max_height] = self._free.get(max_height, 0) + level["available_space"]
+        for max_height in self._pools[CLOSED]:
+            self._pools[CLOSED][max_height].sort()
+            self._pools[OPEN][max_height] = []
+        self._heights = sorted(self._pools[CLOSED])
+
+    def shelf(self, shelf_pos: int):
+        return self._shelves[shelf_pos]
+
+    def _classes(self, height: float):
+        return self._heights[bisect_left(self._heights, height):]
+
+    def _best_fit(self, pool: int, height: float, need: float):
+        """Tightest level with at least need free space; ties go to the lower height class."""
+        best = None
+        for max_height in self._classes(height):
+            levels = self._pools[pool][max_height]
+            i = bisect_left(levels, (need,))
+            if i < len(levels) and (best is None or levels[i][0] < best[0][0]):
+                best = (levels[i], max_height)
+        return best
+
+    def _roomiest(self, pool: int, height: float):
+        best = None
+        for max_height in self._classes(height):
+            levels = self._pools[pool][max_height]
+            if levels and (best is None or levels[-1][0] > best[0][0]):
+                best = (levels[-1], max_height)
+        return best
+
+    def _open_shelf(self, shelf_pos: int):
+        self._opened.add(shelf_pos)
+        for level_name in self._shelves[shelf_pos]["shelf_levels"]:
+            max_height = self._where.get((shelf_pos, level_name))
+            if max_height is None:
+                continue
+            closed = self._pools[CLOSED][max_height]
+            key = self._key(shelf_pos, level_name)
+            del closed[bisect_left(closed, key)]
+            insort(self._pools[OPEN][max_height], key)
+
+    def _key(self, shelf_pos: int, level_name: str):
+        level = self._shelves[shelf_pos]["shelf_levels"][level_name]
+        rank = LEVEL_ORDER.index(level_name) if level_name in LEVEL_ORDER else len(LEVEL_ORDER)
+        return (level["available_space"], shelf_pos, rank, level_name)
+
+    def _reserve(self, key, max_height, space: float):
+        _, shelf_pos, _, level_name = key
+        if shelf_pos not in self._opened:
+            self._open_shelf(shelf_pos)
+        levels = self._pools[OPEN][max_height]
+        del levels[bisect_left(levels, key)]
+        shelf = self._shelves[shelf_pos]
+        shelf["shelf_levels"][level_name]["available_space"] -= space
+        shelf["available_space"] -= space
+        self._free[max_height] -= space
+        insort(levels, self._key(shelf_pos, level_name))
+
+    def _release(self, shelf_pos: int, level_name: str, space: float):
+        # Only reserved levels are released, and reserving opened their shelf
+        max_height = self._where[(shelf_pos, level_name)]
+        levels = self._pools[OPEN][max_height]
+        del levels[bisect_left(levels, self._key(shelf_pos, level_name))]
+        shelf = self._shelves[shelf_pos]
+        shelf["shelf_levels"][level_name]["available_space"] += space
+        shelf["available_space"] += space
+        self._free[max_height] += space
+        insort(levels, self._key(shelf_pos, level_name))
+
+    def _place(self, amount: int, volume: float, height: float):
+        placements = []
+        if amount * volume > sum(self._free[max_height] for max_height in self._classes(height)):
+            return placements, amount
+        requested = amount
+        while amount > 0:
+            need = amount * volume
+            slot = self._best_fit(OPEN, height, need) or self._best_fit(CLOSED, height, need)
+            if slot is None:
+                # Nothing holds the whole rest: take the roomiest level, an open one if it is as roomy
+                opened, closed = self._roomiest(OPEN, height), self._roomiest(CLOSED, height)
+                slot = opened if not closed or (opened and opened[0][0] >= closed[0][0]) else closed
+            if slot is None:
+                break
+            key, max_height = slot
+            units = min(int(key[0] // volume), amount) if volume > 0 else amount
+            if units <= 0:
+                break
+            self._reserve(key, max_height, units * volume)
+            placements.append((key[1], key[3], units))
+            amount -= units
+        if amount > 0:
+            # Free space was there in total but not in whole units: undo the partial placement
+            self.release(placements, volume)
+            return [], requested
+        return placements, amount
+
+    def release(self, placements, volume: float):
+        """Give back the space of placements returned by pack() for a line of this unit volume."""
+        for shelf_pos, level_name, units in placements:
+            self._release(shelf_pos, level_name, units * volume)
+
+    def pack(self, lines):
+        """
+        lines is a list of (amount, volume, height) per unit. Returns, in the
+        same order, ([(shelf_pos, level_name, units), ...], units_left) for each
+        line; units_left is 0, or the whole amount with no placements.
+        """
+        results = [None] * len(lines)
+        order = sorted(range(len(lines)), key=lambda i: (-lines[i][0] * lines[i][1], -lines[i][2], i))
+        for i in order:
+            results[i] = self._place(*lines[i])
+        return results
@@ -0,0 +1,230 @@
+# utils/simulation.py
+
+import heapq
+from collections import deque
+from itertools import count
+
+
+class EventQueue:
+    """Min-heap of (time, seq, kind, payload); seq keeps same-time events in scheduling order."""
+
+    def __init__(self):
+        self._heap = []
+        self._seq = count()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def push(self, time: float, kind: str, payload=None):
+        heapq.heappush(self._heap, (time, next(self._seq), kind, payload))
+
+    def pop(self):
+        time, _, kind, payload = heapq.heappop(self._heap)
+        return time, kind, payload
+
+    def peek_time(self):
+        return self._heap[0][0] if self._heap else None
+
+
+class SimRobot:
+    def __init__(self, robot_id: str, cell):
+        self.robot_id = robot_id
+        self.cell = cell
+        self.tasks = deque()
+        self.busy = False
+        self.busy_time = 0.0
+        self.started_at = 0.0
+        self.completed = 0
+
+
+class SimStation:
+    def __init__(self, station_id: str, cell, queue_length: int = 0):
+        self.station_id = station_id
+        self.cell = cell
+        # Robots already queued when the shift starts are modelled as empty jobs
+        self.queue = deque((None, {"amount": 0}, 0.0) for _ in range(queue_length))
+        self.inbound = 0
+        self.busy = False
+        self.busy_time = 0.0
+        self.served = 0
+        self.total_wait = 0.0
+        self.max_queue = queue_length
+
+    def load(self):
+        return len(self.queue) + self.inbound + (1 if self.busy else 0)
+
+
+class PutawaySimulation:
+    """
+    Discrete-event model of one putaway shift.
+
+    A robot works through its tasks in order: drive to the task's shelf, carry
+    the rack to the least loaded station, wait in that station's FIFO queue,
+    get served, bring the rack back and put the units away on the shelf level.
+    Orders that arrive during the shift are turned into tasks by plan_order and
+    handed to the robot with the least queued work.
+
+    travel_time(from_cell, to_cell) and plan_order(order) are supplied by the
+    caller so the engine itself stays free of database and map concerns.
+    """
+
+    def __init__(self, robots, stations, shelf_cells, travel_time, service_time_base: float = 10.0,
+                 service_time_per_unit: float = 2.0, plan_order=None):
+        self.events = EventQueue()
+        self.robots = {r.robot_id: r for r in robots}
+        self.stations = list(stations)
+        self.shelf_cells = shelf_cells
+        self.travel_time = travel_time
+        self.service_time_base = service_time_base
+        self.service_time_per_unit = service_time_per_unit
+        self.plan_order = plan_order
+        self.now = 0.0
+        self.orders = {}
+        self.tasks_completed = 0
+        self.units_stored = 0
+        self.unplaced_units = 0
+        self.shelf_units = {}
+        self.events_processed = 0
+        for station in self.stations:
+            if station.queue:
+                self._begin_service(station)
+
+    # Scheduling helpers
+
+    def add_task(self, task, at: float = 0.0):
+        robot = self.robots.get(task.get("robot_id")) or min(
+            self.robots.values(), key=lambda r: (len(r.tasks) + r.busy, r.robot_id)
+        )
+        code = task.get("putaway_order_code")
+        order = self.orders.setdefault(code, {"arrived": at, "open_tasks": 0, "finished": None})
+        order["open_tasks"] += 1
+        robot.tasks.append(task)
+        if not robot.busy:
+            self._start_next(robot)
+
+    def add_order(self, order, at: float):
+        self.events.push(at, "order_arrival", order)
+
+    def _start_next(self, robot: SimRobot):
+        if not robot.tasks:
+            robot.busy = False
+            return
+        task = robot.tasks.popleft()
+        robot.busy = True
+        robot.started_at = self.now
+        shelf_cell = self.shelf_cells.get(task["shelf_id"], robot.cell)
+        self.events.push(self.now + self.travel_time(robot.cell, shelf_cell), "at_shelf", (robot, task))
+        robot.cell = shelf_cell
+
+    def _begin_service(self, station: SimStation):
+        robot, task, arrived = station.queue.popleft()
+        station.busy = True
+        station.total_wait += self.now - arrived
+        duration = self.service_time_base + self.service_time_per_unit * task.get("amount", 0)
+        station.busy_time += duration
+        self.events.push(self.now + duration, "service_done", (station, robot, task))
+
+    # Event handlers
+
+    def _on_order_arrival(self, order):
+        code = order.get("order_details", {}).get("putaway_order_code")
+        self.orders.setdefault(code, {"arrived": self.now, "open_tasks": 0, "finished": None})
+        tasks, unplaced = self.plan_order(order) if self.plan_order else ([], 0)
+        self.unplaced_units += unplaced
+        for task in tasks:
+            self.add_task(task, at=self.now)
+
+    def _on_at_shelf(self, payload):
+        robot, task = payload
+        station = min(self.stations, key=lambda s: (s.load(), s.station_id))
+        station.inbound += 1
+        self.events.push(self.now + self.travel_time(robot.cell, station.cell), "at_station", (station, robot, task))
+        robot.cell = station.cell
+
+    def _on_at_station(self, payload):
+        station, robot, task = payload
+        station.inbound -= 1
+        station.queue.append((robot, task, self.now))
+        station.max_queue = max(station.max_queue, len(station.queue))
+        if not station.busy:
+            self._begin_service(station)
+
+    def _on_service_done(self, payload):
+        station, robot, task = payload
+        station.busy = False
+        station.served += 1
+        if station.queue:
+            self._begin_service(station)
+        if robot is None:
+            return
+        shelf_cell = self.shelf_cells.get(task["shelf_id"], robot.cell)
+        self.events.push(self.now + self.travel_time(robot.cell, shelf_cell), "rack_returned", (robot, task))
+        robot.cell = shelf_cell
+
+    def _on_rack_returned(self, payload):
+        robot, task = payload
+        key = (task["shelf_id"], task.get("level"))
+        self.shelf_units[key] = self.shelf_units.get(key, 0) + task.get("amount", 0)
+        self.units_stored += task.get("amount", 0)
+        self.tasks_completed += 1
+        robot.completed += 1
+        robot.busy_time += self.now - robot.started_at
+        order = self.orders.get(task.get("putaway_order_code"))
+        if order:
+            order["open_tasks"] -= 1
+            if order["open_tasks"] == 0:
+                order["finished"] = self.now
+        self._start_next(robot)
+
+    def run(self, until: float):
+        handlers = {
+            "order_arrival": self._on_order_arrival,
+            "at_shelf": self._on_at_shelf,
+            "at_station": self._on_at_station,
+            "service_done": self._on_service_done,
+            "rack_returned": self._on_rack_returned,
+        }
+        while self.events and self.events.peek_time() <= until:
+            self.now, kind, payload = self.events.pop()
+            handlers[kind](payload)
+            self.events_processed += 1
+        self.now = until
+        return self.summary()
+
+    def summary(self):
+        hours = self.now / 3600 if self.now else 0
+        finished = [o for o in self.orders.values() if o["finished"] is not None]
+        return {
+            "simulated_seconds": self.now,
+            "events_processed": self.events_processed,
+            "orders_received": len(self.orders),
+            "orders_completed": len(finished),
+            "tasks_completed": self.tasks_completed,
+            "tasks_open": sum(o["open_tasks"] for o in self.orders.values()),
+            "units_stored": self.units_stored,
+            "units_unplaced": self.unplaced_units,
+            "tasks_per_hour": self.tasks_completed / hours if hours else 0,
+            "avg_order_cycle_seconds": (
+                sum(o["finished"] - o["arrived"] for o in finished) / len(finished) if finished else None
+            ),
+            "robots": [
+                {
+                    "robot_id": r.robot_id,
+                    "tasks_completed": r.completed,
+                    "utilization": r.busy_time / self.now if self.now else 0
+                }
+                for r in self.robots.values()
+            ],
+            "stations": [
+                {
+                    "station_id": s.station_id,
+                    "served": s.served,
+                    "queue_length": len(s.queue),
+                    "max_queue_length": s.max_queue,
+                    "avg_wait_seconds": s.total_wait / s.served if s.served else 0,
+                    "utilization": min(s.busy_time / self.now, 1.0) if self.now else 0
+                }
+                for s in self.stations
+            ],
+            "shelf_levels_filled": len(self.shelf_units)
+        }
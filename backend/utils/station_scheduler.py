@@ -0,0 +1,32 @@
+# utils/station_scheduler.py
+
+import heapq
+
+
+class StationScheduler:
+    """
+    Picks the station for each new task from a min-heap keyed by projected
+    wait: the service time of everything already queued at the station plus
+    what this generation has sent there. A queued task of unknown size counts
+    as service_time_base; a new task adds base + per_unit * amount. Ties go to
+    the shorter projected queue, then the station id.
+    """
+
+    def __init__(self, stations, service_time_base: float = 10.0, service_time_per_unit: float = 2.0):
+        self.service_time_base = service_time_base
+        self.service_time_per_unit = service_time_per_unit
+        self.stations = {s["station_id"]: s for s in stations}
+        self._heap = [
+            (s.get("queue_length", 0) * service_time_base, s.get("queue_length", 0), s["station_id"]) for s in stations
+        ]
+        heapq.heapify(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def assign(self, amount: int = 0):
+        """Station document for a task of amount units; its projected load is updated."""
+        wait, length, station_id = self._heap[0]
+        service_time = self.service_time_base + self.service_time_per_unit * amount
+        heapq.heapreplace(self._heap, (wait + service_time, length + 1, station_id))
+        return self.stations[station_id]
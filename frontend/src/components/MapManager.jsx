@@ -25,9 +25,22 @@ const MapManager = ({ agvMode }) => {
 
   const fetchAvailableMaps = async () => {
     try {
-      const response = await fetch("http://127.0.0.1:8000/api/maps");
-      if (response.ok) {
-        const maps = await response.json();
+      // The list is paginated; follow next_cursor until the last page
+      const maps = [];
+      let cursor = null;
+      do {
+        const url = cursor
+          ? `http://127.0.0.1:8000/api/maps?cursor=${encodeURIComponent(cursor)}`
+          : "http://127.0.0.1:8000/api/maps";
+        const response = await fetch(url);
+        if (!response.ok) {
+          break;
+        }
+        const page = await response.json();
+        maps.push(...page.items);
+        cursor = page.next_cursor;
+      } while (cursor);
+      if (maps.length) {
         const formattedMaps = maps
           .filter((map) => map && map._id)
           .map((map) => ({
@@ -15,7 +15,7 @@ const PutawayTasksTable = () => {
           throw new Error('Failed to fetch tasks');
         }
         const data = await response.json();
-        setTasks(data.tasks); // Set the tasks data in state
+        setTasks(data.items); // Set the tasks data in state
       } catch (err) {
         setError(err.message); // Capture any errors
       } finally {